@@ -5,24 +5,95 @@ Installation script for Chatterbox TTS integration
 
 import subprocess
 import sys
+import re
 import os
+import shutil
+import shlex
+try:
+    import importlib.metadata as _metadata
+except ImportError:  # Python 3.7
+    _metadata = None
+
+# Local wheel cache so re-runs can install without the network
+WHEELHOUSE = "wheelhouse"
+TORCH_CPU_INDEX = "https://download.pytorch.org/whl/cpu"
 
 def run_command(command, description):
-    """Run a command and handle errors"""
+    """Run a command (string or argument list, no shell) and handle errors"""
     print(f"\n{description}...")
-    print(f"Running: {command}")
+    args = shlex.split(command) if isinstance(command, str) else list(command)
+    print(f"Running: {' '.join(args)}")
     
-    try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+    # Resolve the program in-process instead of spawning a shell to find it
+    executable = shutil.which(args[0])
+    if executable is None:
+        print(f"✗ Error: '{args[0]}' not found")
+        return False
+    args[0] = executable
+    
+    # Stream the output live instead of buffering all of it in memory
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, bufsize=1)
+    for line in process.stdout:
+        print(line, end="")
+    returncode = process.wait()
+    
+    if returncode == 0:
         print("✓ Success!")
-        if result.stdout:
-            print(result.stdout)
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Error: {e}")
-        if e.stderr:
-            print(f"Error details: {e.stderr}")
+    print(f"✗ Error: command exited with status {returncode}")
+    return False
+
+def _installed_version(package):
+    """Installed version of package, or None (pkg_resources on Python 3.7)"""
+    if _metadata is not None:
+        try:
+            return _metadata.version(package)
+        except _metadata.PackageNotFoundError:
+            return None
+    import pkg_resources
+    try:
+        return pkg_resources.get_distribution(package).version
+    except pkg_resources.DistributionNotFound:
+        return None
+
+def have(package, min_version=None):
+    """Check locally whether a package is installed (and new enough)"""
+    version = _installed_version(package)
+    if version is None:
         return False
+    if min_version is None:
+        return True
+    try:
+        from packaging.version import Version
+        return Version(version) >= Version(min_version)
+    except ImportError:
+        # Compare the numeric release parts (e.g. "2.1.0+cpu" -> (2, 1, 0))
+        def release(v):
+            return tuple(int(part) for part in re.findall(r"\d+", v.split("+")[0])[:3])
+        return release(version) >= release(min_version)
+
+def pip_install(args, description):
+    """Install packages with uv when it is available, otherwise pip"""
+    if shutil.which("uv"):
+        return run_command(["uv", "pip", "install", "--python", sys.executable] + shlex.split(args),
+                           description)
+    return run_command(f"pip install {args}", description)
+
+def prepare_wheelhouse():
+    """Download the large wheels once into the local wheelhouse"""
+    if os.path.isdir(WHEELHOUSE) and os.listdir(WHEELHOUSE):
+        print(f"✓ Using cached wheels in ./{WHEELHOUSE}")
+        return True
+    
+    os.makedirs(WHEELHOUSE, exist_ok=True)
+    # Build wheels for source dists so they are cached too
+    run_command("pip install wheel", "Installing wheel")
+    return run_command(
+        f"pip download torch torchaudio chatterbox-tts -d {WHEELHOUSE} "
+        f"--index-url {TORCH_CPU_INDEX} --extra-index-url https://pypi.org/simple",
+        "Caching PyTorch and Chatterbox wheels"
+    )
 
 def check_python_version():
     """Check if Python version is compatible"""
@@ -44,30 +115,38 @@ def install_chatterbox_tts():
     if not check_python_version():
         return False
     
-    # Install PyTorch (CPU version for compatibility)
-    if not run_command(
-        "pip install torch torchaudio --index-url https://download.pytorch.org/whl/cpu",
-        "Installing PyTorch (CPU version)"
-    ):
-        print("Failed to install PyTorch. Trying alternative...")
-        if not run_command("pip install torch torchaudio", "Installing PyTorch (default)"):
-            return False
-    
-    # Install Chatterbox TTS
-    if not run_command("pip install chatterbox-tts", "Installing Chatterbox TTS"):
-        return False
+    # Skip the heavy installs entirely when everything is already present
+    core_installed = have("torch", "2.0.0") and have("torchaudio", "2.0.0") and have("chatterbox-tts")
+    if core_installed:
+        print("✓ PyTorch and Chatterbox TTS are already installed")
+    
+    # Try the offline install from the local wheelhouse first
+    offline_success = core_installed or prepare_wheelhouse() and pip_install(
+        f"--no-index --find-links={WHEELHOUSE} torch torchaudio chatterbox-tts",
+        "Installing PyTorch and Chatterbox TTS from local wheels"
+    )
     
-    # Install audio playback libraries
+    if not offline_success:
+        # One resolver pass for PyTorch (CPU version for compatibility) and Chatterbox TTS
+        if not pip_install(
+            f"torch torchaudio chatterbox-tts numpy --index-url {TORCH_CPU_INDEX} "
+            "--extra-index-url https://pypi.org/simple",
+            "Installing PyTorch (CPU version) and Chatterbox TTS"
+        ):
+            print("Failed to install PyTorch. Trying alternative...")
+            if not pip_install("torch torchaudio chatterbox-tts numpy",
+                               "Installing PyTorch (default) and Chatterbox TTS"):
+                return False
+    
+    # Install audio playback libraries one at a time (pip must not run
+    # concurrently in one environment); playsound failing doesn't affect pygame
     print("\nInstalling audio playback libraries...")
-    pygame_success = run_command("pip install pygame", "Installing pygame")
-    playsound_success = run_command("pip install playsound", "Installing playsound")
+    pygame_success = have("pygame", "2.0.0") or pip_install("pygame", "Installing pygame")
+    playsound_success = have("playsound") or pip_install("playsound", "Installing playsound")
     
     if not pygame_success and not playsound_success:
         print("⚠️  Warning: No audio playback library installed. Audio will be generated but not played.")
     
-    # Install other dependencies
-    run_command("pip install numpy", "Installing numpy")
-    
     print("\n=== Installation Complete ===")
     print("✓ Chatterbox TTS should now be available!")
     print("\nTo test the installation, run:")
@@ -84,20 +163,16 @@ def install_gpu_support():
     if not response.lower().startswith('y'):
         return
     
-    # Check for NVIDIA GPU
-    try:
-        result = subprocess.run("nvidia-smi", shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✓ NVIDIA GPU detected")
-            
-            # Install CUDA version of PyTorch
-            run_command(
-                "pip install torch torchaudio --index-url https://download.pytorch.org/whl/cu118",
-                "Installing PyTorch with CUDA support"
-            )
-        else:
-            print("✗ No NVIDIA GPU detected. Keeping CPU version.")
-    except FileNotFoundError:
+    # Check for NVIDIA GPU (nvidia-smi ships with the driver)
+    if shutil.which("nvidia-smi"):
+        print("✓ NVIDIA GPU detected")
+        
+        # Install CUDA version of PyTorch
+        pip_install(
+            "torch torchaudio --index-url https://download.pytorch.org/whl/cu118",
+            "Installing PyTorch with CUDA support"
+        )
+    else:
         print("✗ nvidia-smi not found. No GPU support available.")
 
 if __name__ == "__main__":
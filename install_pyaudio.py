@@ -8,31 +8,76 @@ import subprocess
 import sys
 import platform
 import os
+import shutil
+import shlex
+import importlib
+try:
+    import importlib.metadata as _metadata
+except ImportError:  # Python 3.7
+    _metadata = None
 
 def run_command(command, description):
-    """Run a command and return success status"""
+    """Run a command (string or argument list, no shell) and return success status"""
     print(f"\n{description}...")
+    args = shlex.split(command) if isinstance(command, str) else list(command)
+    
+    # Resolve the program in-process instead of spawning a shell to find it
+    executable = shutil.which(args[0])
+    if executable is None:
+        print(f"✗ {description} failed: '{args[0]}' not found")
+        return False
+    args[0] = executable
+    
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
+        # Stream the output live instead of buffering all of it in memory
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1)
+        for line in process.stdout:
+            print(line, end="")
+        returncode = process.wait()
+        
+        if returncode == 0:
             print(f"✓ {description} successful!")
             return True
         else:
-            print(f"✗ {description} failed: {result.stderr}")
+            print(f"✗ {description} failed (exit status {returncode})")
             return False
     except Exception as e:
         print(f"✗ {description} failed: {e}")
         return False
 
-def check_pyaudio():
-    """Check if PyAudio is already installed"""
+def _installed_version(package):
+    """Installed version of package, or None (pkg_resources on Python 3.7)"""
+    if _metadata is not None:
+        try:
+            return _metadata.version(package)
+        except _metadata.PackageNotFoundError:
+            return None
+    import pkg_resources
     try:
-        import pyaudio
-        print("✓ PyAudio is already installed!")
+        return pkg_resources.get_distribution(package).version
+    except pkg_resources.DistributionNotFound:
+        return None
+
+def have(package):
+    """Check locally whether a package is installed"""
+    return _installed_version(package) is not None
+
+def pip_install(args, description):
+    """Install packages with uv when it is available, otherwise pip"""
+    if shutil.which("uv"):
+        return run_command(["uv", "pip", "install", "--python", sys.executable] + shlex.split(args),
+                           description)
+    return run_command(f"pip install {args}", description)
+
+def check_pyaudio():
+    """Check if PyAudio imports, in a fresh interpreter so a just-finished install is seen"""
+    result = subprocess.run([sys.executable, "-c", "import pyaudio"], capture_output=True)
+    if result.returncode == 0:
+        print("✓ PyAudio is installed!")
         return True
-    except ImportError:
-        print("✗ PyAudio not found, attempting installation...")
-        return False
+    print("✗ PyAudio not found")
+    return False
 
 def install_pyaudio_windows():
     """Install PyAudio on Windows using multiple methods"""
@@ -42,26 +87,24 @@ def install_pyaudio_windows():
     if check_pyaudio():
         return True
     
-    # Method 1: Direct pip install
-    if run_command("pip install pyaudio", "Method 1: Direct pip install"):
-        return check_pyaudio()
+    # Method 1: Official PyPI wheel (fails fast if none exists for this Python)
+    if pip_install("--only-binary=:all: pyaudio", "Method 1: Installing prebuilt wheel") and check_pyaudio():
+        return True
     
     # Method 2: Using pipwin
     print("\nTrying Method 2: Using pipwin...")
-    if run_command("pip install pipwin", "Installing pipwin"):
-        if run_command("pipwin install pyaudio", "Installing PyAudio via pipwin"):
-            return check_pyaudio()
+    if have("pipwin") or pip_install("pipwin", "Installing pipwin"):
+        if run_command("pipwin install pyaudio", "Installing PyAudio via pipwin") and check_pyaudio():
+            return True
     
-    # Method 3: Precompiled wheel for Python 3.11
-    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
-    if python_version == "3.11":
-        wheel_url = "https://download.lfd.uci.edu/pythonlibs/archived/pyaudio-0.2.11-cp311-cp311-win_amd64.whl"
-        if run_command(f"pip install {wheel_url}", "Method 3: Installing precompiled wheel"):
-            return check_pyaudio()
+    # Method 3: Build from source (needs Visual C++ Build Tools)
+    if pip_install("pyaudio", "Method 3: Building from source") and check_pyaudio():
+        return True
     
     # Method 4: Try conda if available
-    if run_command("conda install -c anaconda pyaudio", "Method 4: Conda install"):
-        return check_pyaudio()
+    if (shutil.which("conda") and run_command("conda install -c anaconda pyaudio", "Method 4: Conda install")
+            and check_pyaudio()):
+        return True
     
     print("\n❌ All PyAudio installation methods failed.")
     print("\nAlternative solutions:")
@@ -80,8 +123,11 @@ def install_pyaudio_mac():
         return True
     
     # Install portaudio first
+    if not shutil.which("brew"):
+        print("✗ Homebrew not found. Install it from https://brew.sh to build PyAudio.")
+        return False
     if run_command("brew install portaudio", "Installing portaudio via Homebrew"):
-        if run_command("pip install pyaudio", "Installing PyAudio"):
+        if pip_install("pyaudio", "Installing PyAudio"):
             return check_pyaudio()
     
     return False
@@ -94,12 +140,13 @@ def install_pyaudio_linux():
         return True
     
     # Try apt-get first (Ubuntu/Debian)
-    if run_command("sudo apt-get install python3-pyaudio", "Installing via apt-get"):
-        return check_pyaudio()
+    # (the system package may not be visible to a virtualenv, so verify it)
+    if run_command("sudo apt-get install python3-pyaudio", "Installing via apt-get") and check_pyaudio():
+        return True
     
     # Try installing development packages and pip
     if run_command("sudo apt-get install portaudio19-dev python3-all-dev", "Installing development packages"):
-        if run_command("pip install pyaudio", "Installing PyAudio via pip"):
+        if pip_install("pyaudio", "Installing PyAudio via pip"):
             return check_pyaudio()
     
     return False
@@ -125,8 +172,9 @@ def main():
         print("\n🎉 PyAudio installation successful!")
         print("You can now use voice recognition in your AI assistant.")
         
-        # Test microphone
+        # Test microphone (pick up the freshly installed package in this process)
         try:
+            importlib.invalidate_caches()
             import pyaudio
             p = pyaudio.PyAudio()
             print(f"Available audio devices: {p.get_device_count()}")
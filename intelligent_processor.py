@@ -7,28 +7,48 @@ Combines local commands with LLM-powered responses
 import re
 import json
 import os
+import hashlib
+import importlib.util
+import operator
+import time
+import threading
+from collections import deque, OrderedDict
 from datetime import datetime
-import platform
-import psutil
 from system_control import SystemController
 
-# Try to import LLM libraries
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+def _module_available(name):
+    """Check if a module can be imported without actually importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:
+        return False
+
+# LLM libraries are imported lazily by their handlers
+GEMINI_AVAILABLE = _module_available("google.generativeai")
+OLLAMA_AVAILABLE = _module_available("requests")
+
+# Sentence boundary used to hand streamed LLM text to TTS
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Arithmetic operators supported by simple_math
+_MATH_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
 
+# Optional multi-pattern matcher for local command dispatch
 try:
-    import requests
-    OLLAMA_AVAILABLE = True
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
 except ImportError:
-    OLLAMA_AVAILABLE = False
+    HYPERSCAN_AVAILABLE = False
 
 class ConversationContext:
     """Manages conversation history and context"""
     def __init__(self, max_history=10):
-        self.history = []
+        self.history = deque(maxlen=max_history)  # Oldest exchanges drop off automatically
         self.max_history = max_history
         self.user_preferences = {}
     
@@ -39,83 +59,223 @@ class ConversationContext:
             'user': user_input,
             'assistant': assistant_response
         })
-        
-        # Keep only recent history
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
     
     def get_context_summary(self):
         """Get a summary of recent conversation for LLM context"""
         if not self.history:
             return ""
         
-        recent = self.history[-3:]  # Last 3 exchanges
-        context = "Recent conversation:\n"
-        for exchange in recent:
-            context += f"User: {exchange['user']}\n"
-            context += f"Assistant: {exchange['assistant']}\n"
-        return context
+        recent = list(self.history)[-3:]  # Last 3 exchanges
+        parts = ["Recent conversation:"]
+        parts.extend(f"User: {exchange['user']}\nAssistant: {exchange['assistant']}"
+                     for exchange in recent)
+        return "\n".join(parts) + "\n"
+
+class ResponseCache:
+    """Small thread-safe LRU cache of LLM replies with a time-to-live"""
+    # Answers to these change over time, so they are never cached
+    VOLATILE_RE = re.compile(r'\b(time|date|today|tomorrow|now|weather|news|latest|current)\b', re.IGNORECASE)
+    # Questions that refer back to the conversation; only these are keyed on the context
+    FOLLOW_UP_RE = re.compile(
+        r'\b(it|its|this|that|these|those|they|them|their|he|him|his|she|her|'
+        r'more|else|again|also|another|same|above|previous|last|why)\b', re.IGNORECASE
+    )
+    
+    def __init__(self, max_size=256, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _key(self, user_input, context):
+        # The context always holds the previous exchange, so keying every
+        # question on it would make repeats almost never hit
+        question = " ".join(user_input.lower().split()).rstrip("?.! ")
+        if not self.FOLLOW_UP_RE.search(question):
+            return (question,)
+        return (question, hashlib.blake2b(context.encode(), digest_size=8).digest())
+    
+    def get(self, user_input, context=""):
+        """Return the cached reply, or None if missing or stale"""
+        key = self._key(user_input, context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            reply, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return reply
+    
+    def put(self, user_input, context, reply):
+        """Cache a reply unless the question is time-sensitive"""
+        if self.VOLATILE_RE.search(user_input):
+            return
+        key = self._key(user_input, context)
+        with self._lock:
+            self._entries[key] = (reply, time.monotonic())
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+# Local command table: (pattern, LocalCommandHandler method name).
+# Order matters - the first pattern that matches wins.
+_PATTERN_SPEC = [
+    # Folder operations (prioritize these to avoid greeting conflicts)
+    (r'\bcreate\s+folder\s+(.+?)(?:\s+(?:in|inside|on)\s+(.+))$', 'create_folder_advanced'),
+    (r'\bmake\s+folder\s+(.+?)(?:\s+(?:in|inside|on)\s+(.+))$', 'create_folder_advanced'),
+    (r'\bcreate\s+folder\s+([\w\s]+)', 'create_folder'),
+    (r'\bmake\s+folder\s+([\w\s]+)', 'create_folder'),
+    (r'\bnew\s+folder\s+([\w\s]+)', 'create_folder'),
+
+    # System control
+    (r'\bopen\s+(\w+)', 'open_app'),
+    (r'\bclose\s+(\w+)', 'close_app'),
+    (r'\bvolume\s+(\d+)', 'set_volume'),
+    (r'\bset\s+volume\s+(\d+)', 'set_volume'),
+    (r'\bincrease\s+volume', 'increase_volume'),
+    (r'\bdecrease\s+volume', 'decrease_volume'),
+    (r'\bvolume\s+up', 'increase_volume'),
+    (r'\bvolume\s+down', 'decrease_volume'),
+    (r'\block\s+(computer|pc)', 'lock_computer'),
+    (r'\bshutdown\s+(computer|pc)', 'shutdown_computer'),
+    (r'\brunning\s+(apps|applications)', 'get_running_apps'),
+
+    # Time and date
+    (r'\b(time|clock)\b', 'get_time'),
+    (r'\b(date|today)\b', 'get_date'),
+
+    # System info
+    (r'\b(system|computer|pc)\s+(info|information|stats)\b', 'get_system_info'),
+    (r'\b(cpu|processor)\s+(usage|load)\b', 'get_cpu_usage'),
+    (r'\b(memory|ram)\s+(usage|info)\b', 'get_memory_info'),
+
+    # Simple calculations
+    (r'\b(\d+)\s*([\+\-\*\/])\s*(\d+)\b', 'simple_math'),
+
+    # Greetings (put these last to avoid conflicts)
+    (r'^(hello|hi|hey)$', 'greeting'),
+    (r'^(goodbye|bye|exit|quit)$', 'farewell'),
+]
+
+# Compiled once at import and shared by every LocalCommandHandler
+_COMPILED_PATTERNS = [(re.compile(pattern, re.IGNORECASE), name) for pattern, name in _PATTERN_SPEC]
+
+# Single union regex so dispatch is one C-level scan. Each alternative is a
+# lookahead from the start of the text, so the first pattern in table order
+# wins - the same priority as checking them one by one.
+_UNION_RE = re.compile(
+    "|".join(f"(?=[\\s\\S]*?(?P<h{i}>{pattern}))" for i, (pattern, _) in enumerate(_PATTERN_SPEC)),
+    re.IGNORECASE
+)
+_UNION_GROUP_INDEX = {f"h{i}": i for i in range(len(_PATTERN_SPEC))}
+
+def _build_hyperscan_db():
+    """Compile the pattern table for Hyperscan, or return None to use the union regex"""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    try:
+        hs_flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.encode() for pattern, _ in _PATTERN_SPEC],
+            ids=list(range(len(_PATTERN_SPEC))),
+            elements=len(_PATTERN_SPEC),
+            flags=[hs_flags] * len(_PATTERN_SPEC)
+        )
+        return db
+    except Exception as e:
+        print(f"Hyperscan unavailable, using regex dispatch: {e}")
+        return None
+
+_HS_DB = _build_hyperscan_db()
+
+# Hyperscan scratch space must not be shared by concurrent scans: one per thread
+_hs_local = threading.local()
+
+def _hs_scratch():
+    """This thread's Hyperscan scratch for _HS_DB, allocated on first use"""
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+    return scratch
 
 class LocalCommandHandler:
     """Handles simple commands locally without LLM"""
     def __init__(self):
         self.system_controller = SystemController()
-        self.local_patterns = {
-            # Folder operations (prioritize these to avoid greeting conflicts)
-            r'\bcreate\s+folder\s+(.+?)(?:\s+(?:in|inside|on)\s+(.+))$': self.create_folder_advanced,
-            r'\bmake\s+folder\s+(.+?)(?:\s+(?:in|inside|on)\s+(.+))$': self.create_folder_advanced,
-            r'\bcreate\s+folder\s+([\w\s]+)': self.create_folder,
-            r'\bmake\s+folder\s+([\w\s]+)': self.create_folder,
-            r'\bnew\s+folder\s+([\w\s]+)': self.create_folder,
-            
-            # System control
-            r'\bopen\s+(\w+)': self.open_app,
-            r'\bclose\s+(\w+)': self.close_app,
-            r'\bvolume\s+(\d+)': self.set_volume,
-            r'\bset\s+volume\s+(\d+)': self.set_volume,
-            r'\bincrease\s+volume': self.increase_volume,
-            r'\bdecrease\s+volume': self.decrease_volume,
-            r'\bvolume\s+up': self.increase_volume,
-            r'\bvolume\s+down': self.decrease_volume,
-            r'\block\s+(computer|pc)': self.lock_computer,
-            r'\bshutdown\s+(computer|pc)': self.shutdown_computer,
-            r'\brunning\s+(apps|applications)': self.get_running_apps,
-            
-            # Time and date
-            r'\b(time|clock)\b': self.get_time,
-            r'\b(date|today)\b': self.get_date,
-            
-            # System info
-            r'\b(system|computer|pc)\s+(info|information|stats)\b': self.get_system_info,
-            r'\b(cpu|processor)\s+(usage|load)\b': self.get_cpu_usage,
-            r'\b(memory|ram)\s+(usage|info)\b': self.get_memory_info,
-            
-            # Simple calculations
-            r'\b(\d+)\s*[\+\-\*\/]\s*(\d+)\b': self.simple_math,
-            
-            # Greetings (put these last to avoid conflicts)
-            r'^(hello|hi|hey)$': self.greeting,
-            r'^(goodbye|bye|exit|quit)$': self.farewell,
-        }
+        
+        # Bind the shared compiled table to this instance's handler methods
+        self._patterns = [(regex, getattr(self, name)) for regex, name in _COMPILED_PATTERNS]
+        
+        # System info never changes while running, so it is built once
+        self._sysinfo = None
+        
+        # Sample CPU usage in the background so the command never blocks
+        self._last_cpu = None
+        threading.Thread(target=self._cpu_poller, daemon=True).start()
+        
+        # Canned replies, used round-robin
+        self._greetings = (
+            "Hello! How can I help you today?",
+            "Hi there! What can I do for you?",
+            "Hey! I'm ready to assist you.",
+        )
+        self._farewells = (
+            "Goodbye! Have a great day!",
+            "See you later!",
+            "Take care!",
+        )
+        self._g_idx = 0
+        self._f_idx = 0
+    
+    def _find_pattern(self, text):
+        """Return (regex, handler) for the first pattern that matches, or None"""
+        if _HS_DB is not None:
+            matched_ids = []
+            _HS_DB.scan(
+                text.encode(),
+                match_event_handler=lambda id, start, end, flags, context: matched_ids.append(id),
+                scratch=_hs_scratch()
+            )
+            # Lowest id keeps table priority (folder rules before greetings)
+            return self._patterns[min(matched_ids)] if matched_ids else None
+        
+        union_match = _UNION_RE.match(text)
+        if union_match:
+            return self._patterns[_UNION_GROUP_INDEX[union_match.lastgroup]]
+        return None
+    
+    def dispatch(self, text):
+        """Find the local command for text in one pass: (handler, match) or None"""
+        found = self._find_pattern(text)
+        if found:
+            regex, handler = found
+            # Rerun the winning pattern alone so handlers get their own groups
+            match = regex.search(text)
+            if match:
+                return handler, match
+        return None
+    
+    def run(self, hit, text):
+        """Run a (handler, match) pair returned by dispatch"""
+        handler, match = hit
+        try:
+            return handler(match, text)
+        except Exception as e:
+            return f"Error executing command: {e}"
     
     def can_handle(self, text):
         """Check if this command can be handled locally"""
-        text_lower = text.lower()
-        for pattern in self.local_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        return False
+        return self.dispatch(text) is not None
     
     def execute(self, text):
         """Execute local command"""
-        text_lower = text.lower()
-        for pattern, handler in self.local_patterns.items():
-            match = re.search(pattern, text_lower)
-            if match:
-                try:
-                    return handler(match, text)
-                except Exception as e:
-                    return f"Error executing command: {e}"
+        hit = self.dispatch(text)
+        if hit:
+            return self.run(hit, text)
         
         return "Command not recognized locally"
     
@@ -131,18 +291,37 @@ class LocalCommandHandler:
     
     def get_system_info(self, match, original_text):
         """Get system information"""
-        system = platform.system()
-        release = platform.release()
-        machine = platform.machine()
-        return f"You're running {system} {release} on {machine} architecture"
+        if self._sysinfo is None:
+            import platform
+            system = platform.system()
+            release = platform.release()
+            machine = platform.machine()
+            self._sysinfo = f"You're running {system} {release} on {machine} architecture"
+        return self._sysinfo
+    
+    def _cpu_poller(self, interval=1.0):
+        """Keep self._last_cpu updated with CPU usage over the last interval"""
+        try:
+            import psutil
+        except ImportError:
+            return
+        psutil.cpu_percent(interval=None)  # Prime the counters
+        while True:
+            time.sleep(interval)
+            self._last_cpu = psutil.cpu_percent(interval=None)
     
     def get_cpu_usage(self, match, original_text):
         """Get CPU usage"""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = self._last_cpu
+        if cpu_percent is None:
+            # No sample yet (just started), measure directly
+            import psutil
+            cpu_percent = psutil.cpu_percent(interval=1)
         return f"Current CPU usage is {cpu_percent}%"
     
     def get_memory_info(self, match, original_text):
         """Get memory information"""
+        import psutil
         memory = psutil.virtual_memory()
         used_gb = memory.used / (1024**3)
         total_gb = memory.total / (1024**3)
@@ -150,49 +329,23 @@ class LocalCommandHandler:
     
     def greeting(self, match, original_text):
         """Handle greetings"""
-        greetings = [
-            "Hello! How can I help you today?",
-            "Hi there! What can I do for you?",
-            "Hey! I'm ready to assist you.",
-        ]
-        import random
-        return random.choice(greetings)
+        reply = self._greetings[self._g_idx % len(self._greetings)]
+        self._g_idx += 1
+        return reply
     
     def farewell(self, match, original_text):
         """Handle farewells"""
-        farewells = [
-            "Goodbye! Have a great day!",
-            "See you later!",
-            "Take care!",
-        ]
-        import random
-        return random.choice(farewells)
+        reply = self._farewells[self._f_idx % len(self._farewells)]
+        self._f_idx += 1
+        return reply
     
     def simple_math(self, match, original_text):
         """Handle simple math operations"""
-        try:
-            # Extract the math expression
-            math_match = re.search(r'(\d+)\s*([\+\-\*\/])\s*(\d+)', original_text)
-            if math_match:
-                num1 = int(math_match.group(1))
-                operator = math_match.group(2)
-                num2 = int(math_match.group(3))
-                
-                if operator == '+':
-                    result = num1 + num2
-                elif operator == '-':
-                    result = num1 - num2
-                elif operator == '*':
-                    result = num1 * num2
-                elif operator == '/':
-                    if num2 == 0:
-                        return "Cannot divide by zero!"
-                    result = num1 / num2
-                
-                return f"{num1} {operator} {num2} = {result}"
-        except:
-            pass
-        return "I couldn't calculate that"
+        # Operands and operator come straight from the dispatch pattern
+        num1, op, num2 = int(match.group(1)), match.group(2), int(match.group(3))
+        if op == '/' and num2 == 0:
+            return "Cannot divide by zero!"
+        return f"{num1} {op} {num2} = {_MATH_OPERATORS[op](num1, num2)}"
     
     # System Control Methods
     def open_app(self, match, original_text):
@@ -259,8 +412,10 @@ class GeminiHandler:
         if not self.api_key:
             raise ValueError("Gemini API key required")
         
+        import google.generativeai as genai
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self._cache = ResponseCache()
     
     def get_response(self, user_input, context=""):
         """Get intelligent response from Gemini"""
@@ -270,54 +425,123 @@ class GeminiHandler:
         
         full_prompt = f"{system_prompt}\n\n{context}\nUser: {user_input}\nAssistant:"
         
+        cached = self._cache.get(user_input, context)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.model.generate_content(full_prompt)
-            return response.text.strip()
+            reply = response.text.strip()
+            self._cache.put(user_input, context, reply)
+            return reply
         except Exception as e:
             return f"I'm having trouble thinking right now. Error: {e}"
 
 class OllamaHandler:
     """Local Ollama LLM integration"""
+    supports_streaming = True
+    
     def __init__(self, model="llama3.1:8b", base_url="http://localhost:11434"):
         if not OLLAMA_AVAILABLE:
             raise ImportError("Requests library not available for Ollama")
         
         self.model = model
         self.base_url = base_url
+        
+        # Keep-alive session so each query reuses the local connection
+        import requests
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # Cache the availability check briefly so consecutive turns don't ping Ollama
+        self._available = None
+        self._available_checked_at = 0.0
+        self.availability_ttl = 5.0
+        
+        self._cache = ResponseCache()
     
     def is_available(self):
         """Check if Ollama is running"""
+        now = time.monotonic()
+        if self._available is not None and now - self._available_checked_at < self.availability_ttl:
+            return self._available
+        
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            return response.status_code == 200
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=2)
+            self._available = response.status_code == 200
         except:
-            return False
+            self._available = False
+        self._available_checked_at = now
+        return self._available
     
-    def get_response(self, user_input, context=""):
-        """Get response from local Ollama model"""
+    def get_response(self, user_input, context="", on_sentence=None):
+        """
+        Get response from local Ollama model
+        
+        If on_sentence is given the reply is streamed, and each complete
+        sentence is passed to it as soon as it arrives.
+        """
         if not self.is_available():
             return "Local AI model is not available. Please start Ollama."
         
         system_prompt = "You are a helpful AI assistant. Respond naturally and concisely."
         full_prompt = f"{system_prompt}\n\n{context}\nUser: {user_input}\nAssistant:"
         
+        cached = self._cache.get(user_input, context)
+        if cached is not None:
+            if on_sentence is not None:
+                for sentence in _SENTENCE_END.split(cached):
+                    on_sentence(sentence)
+            return cached
+        
+        stream = on_sentence is not None
         try:
-            response = requests.post(f"{self.base_url}/api/generate", json={
+            response = self._session.post(f"{self.base_url}/api/generate", json={
                 "model": self.model,
                 "prompt": full_prompt,
-                "stream": False,
+                "stream": stream,
                 "options": {
                     "temperature": 0.7,
                     "max_tokens": 150
                 }
-            }, timeout=30)
+            }, timeout=30, stream=stream)
             
-            if response.status_code == 200:
-                return response.json()["response"].strip()
-            else:
+            if response.status_code != 200:
                 return "I'm having trouble with the local AI model."
+            if stream:
+                reply = self._read_stream(response, on_sentence)
+            else:
+                reply = response.json()["response"].strip()
+            self._cache.put(user_input, context, reply)
+            return reply
         except Exception as e:
             return f"Local AI error: {e}"
+    
+    def _read_stream(self, response, on_sentence):
+        """Collect a streamed reply, handing off each finished sentence"""
+        parts = []
+        pending = ""
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            token = chunk.get("response", "")
+            parts.append(token)
+            
+            # Everything before the last sentence boundary is ready to speak
+            *sentences, pending = _SENTENCE_END.split(pending + token)
+            for sentence in sentences:
+                if sentence.strip():
+                    on_sentence(sentence.strip())
+            
+            if chunk.get("done"):
+                break
+        
+        if pending.strip():
+            on_sentence(pending.strip())
+        return "".join(parts).strip()
 
 class IntelligentCommandProcessor:
     """Main intelligent command processor combining local and LLM responses"""
@@ -332,6 +556,11 @@ class IntelligentCommandProcessor:
             'volume up', 'volume down', 'lock', 'shutdown', 
             'create folder', 'make folder', 'new folder', 'running apps'
         }
+        # One whole-word regex instead of a substring scan per entry
+        silent_alternatives = (re.escape(cmd).replace(r"\ ", r"\s+")
+                               for cmd in sorted(self.silent_commands, key=len, reverse=True))
+        self._silent_re = re.compile(r"\b(?:" + "|".join(silent_alternatives) + r")\b",
+                                     re.IGNORECASE)
         
         # Initialize LLM handler
         self.llm_handler = None
@@ -355,20 +584,23 @@ class IntelligentCommandProcessor:
     
     def is_silent_command(self, text):
         """Check if command should execute silently"""
-        text_lower = text.lower()
-        return any(cmd in text_lower for cmd in self.silent_commands)
+        return self._silent_re.search(text) is not None
     
     def process_command(self, text):
         """Process command with intelligent response"""
         if not text.strip():
             return
         
+        return self._process(text, self.local_handler.dispatch(text))
+    
+    def _process(self, text, local_hit):
+        """Respond to text, given its local dispatch result (or None)"""
         print(f"Processing: {text}")
         is_silent = self.is_silent_command(text)
         
         # Try local commands first (fast and free)
-        if self.local_handler.can_handle(text):
-            response = self.local_handler.execute(text)
+        if local_hit:
+            response = self.local_handler.run(local_hit, text)
             print(f"Local response: {response}")
             
             # For system commands, show response but don't speak it
@@ -382,6 +614,25 @@ class IntelligentCommandProcessor:
         elif self.llm_handler:
             print("🤖 Generating AI response...")
             context = self.context.get_context_summary()
+            if self.tts and not is_silent and getattr(self.llm_handler, 'supports_streaming', False):
+                # Queue each sentence on the speech worker as it streams in,
+                # instead of after the full reply; on_done follows the last one
+                print("🔊 Starting voice generation...")
+                streamed = []
+                
+                def on_sentence(sentence):
+                    streamed.append(sentence)
+                    self.tts.speak(sentence, blocking=False, notify=False)
+                
+                response = self.llm_handler.get_response(text, context, on_sentence=on_sentence)
+                if streamed:
+                    self.tts.notify_done()
+                else:
+                    self.tts.speak(response, blocking=False)  # e.g. an error message
+                print(f"AI response: {response}")
+                self.context.add_exchange(text, response)
+                return response
+            
             response = self.llm_handler.get_response(text, context)
             print(f"AI response: {response}")
         
@@ -400,6 +651,18 @@ class IntelligentCommandProcessor:
         
         return response
     
+    def process_commands(self, texts):
+        """Process several queued commands strictly in the order they were queued
+        
+        Every turn is committed to the history, and its speech queued, before
+        the next one runs: an LLM turn's context includes the previous
+        exchanges, so a follow-up must see the reply it follows, and a local
+        command must not act before an earlier request has been answered.
+        Callers must not run batches concurrently (the GUI uses one command
+        worker). Returns one response per text (None for blank ones).
+        """
+        return [self.process_command(text) for text in texts]
+    
     def get_capabilities(self):
         """Get information about current capabilities"""
         capabilities = {
@@ -8,37 +8,86 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext
 import threading
 import queue
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import time
 import sys
 import os
 
 # Load environment variables from .env file
-def load_env_file():
-    """Load environment variables from .env file"""
-    try:
-        with open('.env', 'r') as f:
-            for line in f:
-                if '=' in line and not line.startswith('#'):
-                    key, value = line.strip().split('=', 1)
-                    os.environ[key] = value
-    except FileNotFoundError:
-        pass
-
-# Load environment variables
-load_env_file()
-
-# Import our modules
-from voice_recognition import VoiceRecognition
-from text_to_speech import TextToSpeech
-from command_processor import CommandProcessor
+from setup_gemini import load_env_file
+load_env_file(verbose=False)
 
 class AIAssistantGUI:
+    # Fixed attribute set: faster lookups on the event-callback hot path, no __dict__
+    __slots__ = (
+        'root', 'voice_recognition', 'text_to_speech', 'command_processor',
+        'is_listening', '_listen_event', '_listen_thread',
+        'message_queue', '_executor', '_pending_lines', '_partial_active', '_last_tts_settings',
+        '_engine_info_text', '_info_window', '_clear_id', '_handlers',
+        'status_var', 'action_var', 'action_label',
+        'start_btn', 'stop_btn', 'test_tts_btn', 'engine_info_btn',
+        'language_var', 'language_combo', 'emotion_var', 'emotion_scale',
+        'speed_var', 'speed_scale', 'text_input', 'transcript_text', 'commands_text',
+    )
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("AI Assistant - Phase 1")
         self.root.geometry("800x600")
         
-        # Initialize components
+        # GUI state
+        self.is_listening = False
+        self._clear_id = None  # Pending after() that clears the action feedback
+        self._last_tts_settings = (None, None, None)  # Last (language, emotion, speed) applied
+        
+        # TTS info dialog, built on first use and reused afterwards
+        self._engine_info_text = None
+        self._info_window = None
+        
+        # Message queue for thread communication
+        self.message_queue = queue.SimpleQueue()
+        
+        # Log lines waiting to be inserted on the next idle pass, per widget
+        self._pending_lines = {}
+        self._partial_active = False  # In-progress voice text shown at the end of the transcript
+        
+        # Paint the window before the slow speech/AI imports below
+        self.setup_gui()
+        self.status_var.set("Loading...")
+        self.root.update_idletasks()
+        
+        self._init_components()
+        self.status_var.set("Ready to start")
+        
+        # One long-lived thread runs voice recognition whenever listening is requested
+        self._listen_event = threading.Event()
+        self._listen_thread = threading.Thread(target=self._listen_worker, daemon=True)
+        self._listen_thread.start()
+        
+        # Commands run here so LLM calls never block the Tk main thread; one
+        # worker keeps batches in order against the shared conversation context
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="command")
+        
+        self.setup_callbacks()
+        
+        # process_queue handlers for messages that need no per-drain batching
+        self._handlers = {
+            'partial': self.show_partial,
+            'transcript': self._show_voice_transcript,
+            'speech_done': self._clear_speaking,
+            'status': self.status_var.set,
+            'error': self.status_var.set,
+        }
+        
+        # Worker threads wake the GUI through a virtual event instead of polling
+        self.root.bind('<<QueueMsg>>', self.process_queue)
+        self.process_queue()
+    
+    def _init_components(self):
+        """Import and create the speech and command components"""
+        from voice_recognition import VoiceRecognition
+        from text_to_speech import TextToSpeech
+        
         self.voice_recognition = VoiceRecognition()
         self.text_to_speech = TextToSpeech()
         
@@ -63,17 +112,12 @@ class AIAssistantGUI:
             from command_processor import CommandProcessor
             self.command_processor = CommandProcessor(self.text_to_speech)
         
-        # GUI state
-        self.is_listening = False
-        
-        # Message queue for thread communication
-        self.message_queue = queue.Queue()
-        
-        self.setup_gui()
-        self.setup_callbacks()
-        self.process_queue()
-        
+        self.update_language_options()
+    
     def setup_gui(self):
+        # Keep the window unmapped until every widget is placed, so Tk lays it out once
+        self.root.withdraw()
+        
         # Main frame
         main_frame = ttk.Frame(self.root, padding="20")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -126,7 +170,7 @@ class AIAssistantGUI:
         self.language_combo = ttk.Combobox(tts_frame, textvariable=self.language_var, 
                                           width=15, state="readonly")
         self.language_combo.grid(row=0, column=1, padx=(5, 20))
-        self.update_language_options()
+        # Options are filled in by _init_components once the TTS engine exists
         
         # Emotion control
         ttk.Label(tts_frame, text="Emotion:").grid(row=0, column=2, sticky=tk.W)
@@ -169,6 +213,9 @@ class AIAssistantGUI:
                                                         height=10, width=70)
         self.transcript_text.grid(row=6, column=0, columnspan=3, 
                                  pady=(0, 20), sticky=(tk.W, tk.E))
+        self.transcript_text.configure(undo=False, autoseparators=False, maxundo=0, 
+                                       state=tk.DISABLED)  # Append-only log
+        self.transcript_text.tag_configure('partial', foreground='grey')
         
         # Commands history
         commands_label = ttk.Label(main_frame, text="Command History:", 
@@ -179,6 +226,8 @@ class AIAssistantGUI:
                                                       height=8, width=70)
         self.commands_text.grid(row=8, column=0, columnspan=3, 
                                sticky=(tk.W, tk.E))
+        self.commands_text.configure(undo=False, autoseparators=False, maxundo=0, 
+                                     state=tk.DISABLED)  # Append-only log
         
         # Configure grid weights
         self.root.columnconfigure(0, weight=1)
@@ -186,6 +235,8 @@ class AIAssistantGUI:
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(6, weight=1)
         main_frame.rowconfigure(8, weight=1)
+        
+        self.root.deiconify()
     
     def setup_callbacks(self):
         # Set up voice recognition callbacks
@@ -193,9 +244,13 @@ class AIAssistantGUI:
             on_result=self.on_voice_result,
             on_error=self.on_voice_error,
             on_start=self.on_voice_start,
-            on_stop=self.on_voice_stop
+            on_stop=self.on_voice_stop,
+            on_partial=self.on_voice_partial
         )
         
+        # Clear the speaking status when the reply has actually been spoken
+        self.text_to_speech.on_done = self.on_speech_done
+        
         # Keyboard shortcuts
         self.root.bind('<Control-space>', lambda e: self.toggle_listening())
         self.root.bind('<Escape>', lambda e: self.stop_listening())
@@ -206,9 +261,15 @@ class AIAssistantGUI:
             self.start_btn.config(state="disabled")
             self.stop_btn.config(state="normal")
             
-            # Start voice recognition in separate thread
-            threading.Thread(target=self.voice_recognition.start_listening, 
-                           daemon=True).start()
+            # Wake the voice recognition worker
+            self._listen_event.set()
+    
+    def _listen_worker(self):
+        """Run voice recognition each time start_listening wakes us (worker thread)"""
+        while True:
+            self._listen_event.wait()
+            self._listen_event.clear()
+            self.voice_recognition.start_listening()  # Returns once listening stops
     
     def stop_listening(self):
         if self.is_listening:
@@ -233,8 +294,15 @@ class AIAssistantGUI:
     
     def show_engine_info(self):
         """Show TTS engine information"""
-        info = self.text_to_speech.get_engine_info()
-        info_text = f"""TTS Engine Information:
+        # Reuse the window if it was already built
+        if self._info_window is not None and self._info_window.winfo_exists():
+            self._info_window.deiconify()
+            self._info_window.lift()
+            return
+        
+        if self._engine_info_text is None:
+            info = self.text_to_speech.get_engine_info()
+            self._engine_info_text = f"""TTS Engine Information:
         
 Engine: {info['engine']}
 Device: {info['device']}
@@ -244,128 +312,224 @@ Emotion Control: {info['emotion_control']}
 Available Languages: {info['languages']}
         """
         
-        # Create info window
+        # Create info window; closing it only hides it
         info_window = tk.Toplevel(self.root)
         info_window.title("TTS Engine Info")
         info_window.geometry("400x300")
+        info_window.protocol("WM_DELETE_WINDOW", info_window.withdraw)
         
         text_widget = scrolledtext.ScrolledText(info_window, wrap=tk.WORD)
         text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        text_widget.insert(tk.END, info_text)
+        text_widget.insert(tk.END, self._engine_info_text)
         text_widget.config(state=tk.DISABLED)
+        self._info_window = info_window
     
     def test_tts(self):
         """Test TTS with current settings"""
-        # Get current settings
-        language = self.language_var.get()
-        exaggeration = self.emotion_var.get()
-        cfg = self.speed_var.get()
-        
-        # Apply settings to TTS
-        self.text_to_speech.set_language(language)
-        self.text_to_speech.set_exaggeration(exaggeration)
-        self.text_to_speech.set_cfg(cfg)
+        language, exaggeration, cfg = self._apply_tts_settings()
         
         # Test phrase
         phrase = self.text_to_speech.test_speech()
         self.add_to_transcript(f"TTS Test ({language}, emotion={exaggeration:.1f}, speed={cfg:.1f}): {phrase}")
     
+    def _current_tts_settings(self):
+        """Read (language, emotion, speed) from the controls"""
+        return (self.language_var.get(), self.emotion_var.get(), self.speed_var.get())
+    
+    def _apply_tts_settings(self):
+        """Push the control settings to TTS if they changed; returns them"""
+        settings = self._current_tts_settings()
+        if settings != self._last_tts_settings:
+            language, exaggeration, cfg = settings
+            self.text_to_speech.set_language(language)
+            self.text_to_speech.set_exaggeration(exaggeration)
+            self.text_to_speech.set_cfg(cfg)
+            self._last_tts_settings = settings
+        return settings
+    
     def process_text_input(self, event=None):
         """Process text input as command"""
         text = self.text_input.get().strip()
         if text:
             self.text_input.delete(0, tk.END)
             
-            # Apply current TTS settings
-            language = self.language_var.get()
-            exaggeration = self.emotion_var.get()
-            cfg = self.speed_var.get()
-            
-            self.text_to_speech.set_language(language)
-            self.text_to_speech.set_exaggeration(exaggeration)
-            self.text_to_speech.set_cfg(cfg)
-            
             self.add_to_transcript(f"You (text): {text}")
             
             # Check if it's a silent command
             if hasattr(self.command_processor, 'is_silent_command') and self.command_processor.is_silent_command(text):
                 # Show immediate visual feedback
+                self._cancel_action_clear()
                 self.action_var.set("Executing...")
-                self.root.update()
                 
                 # Process command silently
-                response = self.command_processor.process_command(text)
-                
-                # Show result briefly
-                if response:
-                    self.action_var.set(f"✓ {response}")
-                    self.root.after(3000, lambda: self.action_var.set(""))  # Clear after 3 seconds
-                    self.add_to_commands(f"{datetime.now().strftime('%H:%M:%S')}: {text}")
-                    self.add_to_transcript(f"Assistant: {response}")
+                self.submit_commands([text], feedback='silent')
             else:
                 # Show "thinking" indicator for AI commands
+                self._cancel_action_clear()
                 self.action_var.set("🤖 Thinking...")
-                self.root.update()
                 
                 # Process command (with TTS)
-                response = self.command_processor.process_command(text)
-                
-                if response:
-                    # Show text response immediately
-                    self.add_to_commands(f"{datetime.now().strftime('%H:%M:%S')}: {text}")
-                    self.add_to_transcript(f"Assistant: {response}")
-                    
-                    # Show voice generation status
-                    self.action_var.set("🔊 Speaking...")
-                    self.root.update()
-                    
-                    # Clear status after estimated speech time
-                    estimated_time = len(response) * 50  # ~50ms per character
-                    self.root.after(estimated_time, lambda: self.action_var.set(""))
+                self.submit_commands([text], feedback='spoken')
+    
+    def show_response(self, text, response, feedback=None, stamp=None):
+        """Show a command's response (GUI thread); stamp is its HH:MM:SS time"""
+        if not response:
+            if feedback:
+                self.action_var.set("")
+            return
+        
+        if feedback == 'silent':
+            # Show result briefly
+            self.action_var.set(f"✓ {response}")
+            self._cancel_action_clear()
+            self._clear_id = self.root.after(3000, self._clear_action)  # Clear after 3 seconds
+        
+        # Show text response immediately
+        self.add_to_commands(f"{stamp or time.strftime('%H:%M:%S')}: {text}")
+        self.add_to_transcript(f"Assistant: {response}")
+        
+        if feedback == 'spoken':
+            # Show voice generation status until on_speech_done
+            self.action_var.set("🔊 Speaking...")
+    
+    def _clear_action(self):
+        self._clear_id = None
+        self.action_var.set("")
+    
+    def _cancel_action_clear(self):
+        """Drop a pending clear so it cannot wipe newer feedback"""
+        if self._clear_id is not None:
+            self.root.after_cancel(self._clear_id)
+            self._clear_id = None
+    
+    def post_message(self, msg_type, data=None):
+        """Queue a message from any thread and wake up the GUI thread"""
+        self.message_queue.put((msg_type, data))
+        try:
+            self.root.event_generate('<<QueueMsg>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # Window is closing
     
     def on_voice_result(self, text):
-        self.message_queue.put(('transcript', text))
-        self.message_queue.put(('command', text))
+        self.post_message('transcript', text)
+        self.post_message('command', text)
+    
+    def on_voice_partial(self, text):
+        self.post_message('partial', text)
     
     def on_voice_error(self, error):
-        self.message_queue.put(('error', f"Voice recognition error: {error}"))
+        self.post_message('error', f"Voice recognition error: {error}")
+    
+    def on_speech_done(self):
+        self.post_message('speech_done')
     
     def on_voice_start(self):
-        self.message_queue.put(('status', 'Listening...'))
+        self.post_message('status', 'Listening...')
     
     def on_voice_stop(self):
-        self.message_queue.put(('status', 'Stopped listening'))
+        self.post_message('status', 'Stopped listening')
+    
+    def process_queue(self, event=None):
+        """Drain every pending message, running queued commands as one batch"""
+        message_queue = self.message_queue
+        handlers = self._handlers
+        commands = []
+        stamp = None  # One timestamp for every response in this drain
+        while message_queue.qsize():
+            try:
+                msg_type, data = message_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if msg_type == 'command':
+                commands.append(data)
+            elif msg_type == 'response':
+                if stamp is None:
+                    stamp = time.strftime('%H:%M:%S')
+                self.show_response(*data, stamp=stamp)
+            else:
+                handlers[msg_type](data)
+        
+        if commands:
+            self.submit_commands(commands)
+    
+    def _show_voice_transcript(self, text):
+        self.add_to_transcript(f"You: {text}")
     
-    def process_queue(self):
+    def _clear_speaking(self, _data=None):
+        if self.action_var.get() == "🔊 Speaking...":
+            self.action_var.set("")
+    
+    def submit_commands(self, commands, feedback=None):
+        """Process commands on the worker pool; responses come back as queue messages"""
+        self._apply_tts_settings()
+        future = self._executor.submit(self.run_commands, commands)
+        future.add_done_callback(lambda f: self._post_responses(commands, f, feedback))
+    
+    def run_commands(self, commands):
+        """Process commands in order, as one batch when supported (worker thread)"""
+        if hasattr(self.command_processor, 'process_commands'):
+            return self.command_processor.process_commands(commands)
+        return [self.command_processor.process_command(text) for text in commands]
+    
+    def _post_responses(self, commands, future, feedback):
+        """Hand finished responses back to the GUI thread"""
         try:
-            while True:
-                msg_type, data = self.message_queue.get_nowait()
-                
-                if msg_type == 'transcript':
-                    self.add_to_transcript(f"You: {data}")
-                elif msg_type == 'command':
-                    response = self.command_processor.process_command(data)
-                    if response:
-                        self.add_to_commands(f"{datetime.now().strftime('%H:%M:%S')}: {data}")
-                        self.add_to_transcript(f"Assistant: {response}")
-                elif msg_type == 'status':
-                    self.status_var.set(data)
-                elif msg_type == 'error':
-                    self.status_var.set(data)
-                    
-        except queue.Empty:
-            pass
-        
-        # Schedule next check
-        self.root.after(100, self.process_queue)
+            responses = future.result()
+        except Exception as e:
+            if feedback:
+                self.post_message('response', (None, None, feedback))
+            self.post_message('error', f"Command error: {e}")
+            return
+        for text, response in zip(commands, responses):
+            self.post_message('response', (text, response, feedback))
     
     def add_to_transcript(self, text):
-        self.transcript_text.insert(tk.END, f"{text}\n")
-        self.transcript_text.see(tk.END)
+        self._clear_partial()
+        self._append_line(self.transcript_text, text)
+    
+    def show_partial(self, text):
+        """Show in-progress voice text (greyed) in place of the previous partial"""
+        widget = self.transcript_text
+        self._flush_lines(widget)  # Keep committed lines above the partial
+        self._clear_partial()
+        if not text:
+            return
+        widget.mark_set('partial', 'end-1c')
+        widget.mark_gravity('partial', tk.LEFT)
+        widget.configure(state=tk.NORMAL)
+        widget.insert(tk.END, f"You: {text}\n", 'partial')
+        widget.configure(state=tk.DISABLED)
+        widget.see(tk.END)
+        self._partial_active = True
+    
+    def _clear_partial(self):
+        if self._partial_active:
+            self.transcript_text.configure(state=tk.NORMAL)
+            self.transcript_text.delete('partial', tk.END)
+            self.transcript_text.configure(state=tk.DISABLED)
+            self._partial_active = False
     
     def add_to_commands(self, text):
-        self.commands_text.insert(tk.END, f"{text}\n")
-        self.commands_text.see(tk.END)
+        self._append_line(self.commands_text, text)
+    
+    def _append_line(self, widget, text):
+        """Queue a line for widget; bursts are inserted and scrolled once when idle"""
+        pending = self._pending_lines.get(widget)
+        if pending is None:
+            pending = self._pending_lines[widget] = []
+            self.root.after_idle(self._flush_lines, widget)
+        pending.append(f"{text}\n")
+    
+    def _flush_lines(self, widget):
+        lines = self._pending_lines.pop(widget, None)
+        if lines:
+            end = tk.END
+            configure = widget.configure
+            configure(state=tk.NORMAL)
+            widget.insert(end, "".join(lines))
+            configure(state=tk.DISABLED)
+            widget.see(end)
     
     def run(self):
         try:
@@ -373,6 +537,7 @@ Available Languages: {info['languages']}
         except KeyboardInterrupt:
             print("Shutting down...")
         finally:
+            self._executor.shutdown(wait=False)
             self.voice_recognition.cleanup()
             self.text_to_speech.cleanup()
 
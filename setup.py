@@ -2,14 +2,22 @@
 Setup script for AI Assistant
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="ai-assistant",
     version="1.0.0",
     description="Cross-platform AI assistant with voice recognition and TTS",
     author="Your Name",
-    packages=find_packages(),
+    # Flat layout: list the modules instead of scanning the tree for packages
+    py_modules=[
+        "main",
+        "intelligent_processor",
+        "system_control",
+        "voice_recognition",
+        "text_to_speech",
+        "setup_gemini",
+    ],
     install_requires=[
         "speechrecognition>=3.10.0",
         "pyttsx3>=2.90",
@@ -59,19 +59,28 @@ def setup_gemini_api():
         print(f"❌ API key test failed: {e}")
         return False
 
-def load_env_file():
-    """Load environment variables from .env file"""
+def load_env_file(path='.env', verbose=True):
+    """Load environment variables from .env file (read once, applied in one update)"""
     try:
-        with open('.env', 'r') as f:
-            for line in f:
-                if '=' in line and not line.startswith('#'):
-                    key, value = line.strip().split('=', 1)
-                    os.environ[key] = value
-        print("✓ Environment variables loaded from .env")
+        with open(path, 'rb') as f:
+            data = f.read().decode('utf-8', 'replace')
     except FileNotFoundError:
-        pass
+        return
     except Exception as e:
-        print(f"⚠️  Error loading .env file: {e}")
+        if verbose:
+            print(f"⚠️  Error loading .env file: {e}")
+        return
+    
+    env = {}
+    for line in data.splitlines():
+        if not line or line[0] == '#' or '=' not in line:
+            continue
+        key, _, value = line.partition('=')
+        env[key.strip()] = value.strip()
+    os.environ.update(env)
+    
+    if verbose:
+        print("✓ Environment variables loaded from .env")
 
 if __name__ == "__main__":
     print("Google Gemini API Setup for AI Assistant\n")
@@ -7,57 +7,208 @@ Basic phone/PC control functionality
 import subprocess
 import os
 import platform
+import signal
 import psutil
 import shutil
+import types
 from pathlib import Path
 
+# The OS never changes while we run, so resolve it once at import
+_OS_TYPE = platform.system()
+_IS_WINDOWS = _OS_TYPE == "Windows"
+_HAS_PROC = os.path.isdir('/proc')
+
+# Spoken application names and the Windows executables they launch
+_APP_TABLE = types.MappingProxyType({
+    'notepad': 'notepad.exe',
+    'calculator': 'calc.exe',
+    'paint': 'mspaint.exe',
+    'browser': 'chrome.exe',
+    'chrome': 'chrome.exe',
+    'firefox': 'firefox.exe',
+    'edge': 'msedge.exe',
+    'file explorer': 'explorer.exe',
+    'explorer': 'explorer.exe',
+    'cmd': 'cmd.exe',
+    'powershell': 'powershell.exe'
+})
+
+# Running process names that differ from the launched executable: calc.exe
+# is a stub that starts the Windows 10/11 Calculator app and exits at once
+_RUNNING_EXES = types.MappingProxyType({
+    'calculator': 'calculatorapp.exe',
+})
+
+# Windows executables get_running_apps lists (other .exe names are skipped)
+_LISTED_EXES = frozenset({'notepad.exe', 'calc.exe', 'calculatorapp.exe', 'chrome.exe', 'firefox.exe'})
+
+# Sign prefix of a relative volume change -> how it is reported
+_VOLUME_OPS = {'+': 'increased by', '-': 'decreased by'}
+
+# Spoken location names that map straight to a folder in the home directory
+_KNOWN_LOCATIONS = {
+    'desktop': 'Desktop',
+    'documents': 'Documents',
+    'downloads': 'Downloads',
+}
+
+if _IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+    
+    _TH32CS_SNAPPROCESS = 0x00000002
+    _INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+    
+    class _PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ('dwSize', wintypes.DWORD),
+            ('cntUsage', wintypes.DWORD),
+            ('th32ProcessID', wintypes.DWORD),
+            ('th32DefaultHeapID', ctypes.c_size_t),
+            ('th32ModuleID', wintypes.DWORD),
+            ('cntThreads', wintypes.DWORD),
+            ('th32ParentProcessID', wintypes.DWORD),
+            ('pcPriClassBase', ctypes.c_long),
+            ('dwFlags', wintypes.DWORD),
+            ('szExeFile', ctypes.c_wchar * 260),
+        ]
+    
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    _kernel32.Process32FirstW.argtypes = (wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W))
+    _kernel32.Process32NextW.argtypes = (wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W))
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+
+def _launch(argv):
+    """Start a program without waiting for it; spawn errors (e.g. a missing executable) raise"""
+    subprocess.Popen(argv, close_fds=True)
+
+
+_COMM_LEN = 15  # The kernel truncates /proc/<pid>/comm to this many characters
+
+
+def _untruncated_name(pid, comm):
+    """Full executable name for a process whose comm may have been cut short
+    
+    Tries the basename of /proc/<pid>/exe, then of argv[0] (like psutil),
+    keeping comm unless the longer name starts with it.
+    """
+    try:
+        candidate = os.path.basename(os.readlink(f'/proc/{pid}/exe'))
+    except OSError:
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                argv0 = f.read().split(b'\0', 1)[0].decode(errors='replace')
+        except OSError:
+            return comm
+        candidate = os.path.basename(argv0)
+    return candidate if candidate.startswith(comm) else comm
+
+
+def _iter_process_names():
+    """Yield (pid, name) for running processes, reading only the name
+    
+    psutil.process_iter gathers much more per-process state than a name
+    match needs, so Linux reads /proc/<pid>/comm and Windows walks a
+    Toolhelp snapshot; other systems fall back to psutil.
+    """
+    if _HAS_PROC:
+        for entry in os.scandir('/proc'):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry.name}/comm', 'rb') as f:
+                    name = f.read().rstrip(b'\n').decode(errors='replace')
+            except OSError:
+                continue  # Exited or not readable
+            if len(name) >= _COMM_LEN:
+                name = _untruncated_name(entry.name, name)
+            yield int(entry.name), name
+    elif _IS_WINDOWS:
+        snapshot = _kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+        if snapshot == _INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            entry = _PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(_PROCESSENTRY32W)
+            more = _kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while more:
+                yield entry.th32ProcessID, entry.szExeFile
+                more = _kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            _kernel32.CloseHandle(snapshot)
+    else:
+        for proc in psutil.process_iter():
+            try:
+                with proc.oneshot():
+                    name = proc.name()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if name:
+                yield proc.pid, name
+
+
+def _terminate_process(pid):
+    """Ask a process to exit, like psutil.Process.terminate()"""
+    if _IS_WINDOWS:
+        psutil.Process(pid).terminate()
+    else:
+        os.kill(pid, signal.SIGTERM)
+
 class SystemController:
     """Handles basic system control operations"""
     
     def __init__(self):
-        self.os_type = platform.system()
+        self._home = Path.home()
+        self._desktop = self._home / "Desktop"
         
+        # Search PATH once and pick each app's launcher up front:
+        # name -> (launch function, its argument)
+        self._apps = {}
+        if _IS_WINDOWS:
+            for name, exe in _APP_TABLE.items():
+                path = shutil.which(exe)
+                if path:
+                    self._apps[name] = (_launch, [path])
+                else:
+                    # Not on PATH (typical for browsers): ShellExecute also checks App Paths
+                    self._apps[name] = (os.startfile, exe)
+    
     def open_application(self, app_name):
         """Open applications by name"""
         app_name = app_name.lower()
         
-        if self.os_type == "Windows":
-            apps = {
-                'notepad': 'notepad.exe',
-                'calculator': 'calc.exe',
-                'paint': 'mspaint.exe',
-                'browser': 'start chrome',
-                'chrome': 'start chrome',
-                'firefox': 'start firefox',
-                'edge': 'start msedge',
-                'file explorer': 'explorer.exe',
-                'explorer': 'explorer.exe',
-                'cmd': 'cmd.exe',
-                'powershell': 'powershell.exe'
-            }
-            
-            if app_name in apps:
-                try:
-                    if apps[app_name].startswith('start '):
-                        os.system(apps[app_name])
-                    else:
-                        subprocess.Popen(apps[app_name])
-                    return f"Opening {app_name}"
-                except Exception as e:
-                    return f"Failed to open {app_name}: {e}"
-            else:
+        if _IS_WINDOWS:
+            app = self._apps.get(app_name)
+            if app is None:
                 return f"Application '{app_name}' not recognized"
+            
+            launch, target = app
+            try:
+                launch(target)
+                return f"Opening {app_name}"
+            except Exception as e:
+                return f"Failed to open {app_name}: {e}"
         
-        return f"Application control not implemented for {self.os_type}"
+        return f"Application control not implemented for {_OS_TYPE}"
     
     def close_application(self, app_name):
         """Close applications by name"""
         app_name = app_name.lower()
+        # Match the executable exactly; spoken names map through the app table
+        if _IS_WINDOWS:
+            targets = {_APP_TABLE.get(app_name, f"{app_name}.exe")}
+            if app_name in _RUNNING_EXES:
+                targets.add(_RUNNING_EXES[app_name])
+        else:
+            targets = {app_name}
         
         try:
-            for proc in psutil.process_iter(['pid', 'name']):
-                if app_name in proc.info['name'].lower():
-                    proc.terminate()
+            for pid, name in _iter_process_names():
+                if name.lower() in targets:
+                    _terminate_process(pid)
                     return f"Closed {app_name}"
             return f"Application '{app_name}' not found running"
         except Exception as e:
@@ -65,7 +216,7 @@ class SystemController:
     
     def set_volume(self, level):
         """Set system volume (Windows only for now)"""
-        if self.os_type == "Windows":
+        if _IS_WINDOWS:
             try:
                 # Use nircmd for volume control (would need to be installed)
                 # For now, use a simple approach
@@ -75,44 +226,42 @@ class SystemController:
             except Exception as e:
                 return f"Failed to set volume: {e}"
         
-        return f"Volume control not implemented for {self.os_type}"
+        return f"Volume control not implemented for {_OS_TYPE}"
     
     def lock_computer(self):
         """Lock the computer"""
-        if self.os_type == "Windows":
+        if _IS_WINDOWS:
             try:
-                os.system('rundll32.exe user32.dll,LockWorkStation')
+                _launch(['rundll32.exe', 'user32.dll,LockWorkStation'])
                 return "Computer locked"
             except Exception as e:
                 return f"Failed to lock computer: {e}"
         
-        return f"Lock function not implemented for {self.os_type}"
+        return f"Lock function not implemented for {_OS_TYPE}"
     
     def shutdown_computer(self, delay=60):
         """Shutdown computer with delay"""
-        if self.os_type == "Windows":
+        if _IS_WINDOWS:
             try:
-                os.system(f'shutdown /s /t {delay}')
+                _launch(['shutdown', '/s', '/t', str(int(delay))])
                 return f"Computer will shutdown in {delay} seconds"
             except Exception as e:
                 return f"Failed to schedule shutdown: {e}"
         
-        return f"Shutdown not implemented for {self.os_type}"
+        return f"Shutdown not implemented for {_OS_TYPE}"
     
     def create_folder(self, folder_name, path=None):
         """Create a new folder"""
         try:
-            # Use Desktop as default location for user folders
+            # Use Desktop as default location for user folders (created if missing)
             if path is None:
-                desktop = Path.home() / "Desktop"
-                if desktop.exists():
-                    path = desktop
-                else:
-                    path = Path.home()
+                path = self._desktop
             
             folder_path = Path(path) / folder_name
-            folder_path.mkdir(exist_ok=True)
+            folder_path.mkdir(parents=True, exist_ok=True)
             return f"Created folder '{folder_name}' on {path}"
+        except PermissionError:
+            return f"Failed to create folder: no permission to write in {path}"
         except Exception as e:
             return f"Failed to create folder: {e}"
     
@@ -121,24 +270,23 @@ class SystemController:
         try:
             # Handle common location names
             location_lower = location.lower()
+            known = _KNOWN_LOCATIONS.get(location_lower)
             
-            if location_lower in ['desktop']:
-                base_path = Path.home() / "Desktop"
-            elif location_lower in ['documents']:
-                base_path = Path.home() / "Documents"
-            elif location_lower in ['downloads']:
-                base_path = Path.home() / "Downloads"
+            if known is not None:
+                base_path = self._home / known
             else:
                 # Try to find the folder on Desktop first (case-insensitive)
-                desktop = Path.home() / "Desktop"
+                desktop = self._desktop
                 
-                # Look for existing folder (case-insensitive)
+                # Look for existing folder (case-insensitive); scandir's
+                # entries answer is_dir() without a stat per item
                 found_folder = None
-                if desktop.exists():
-                    for item in desktop.iterdir():
-                        if item.is_dir() and item.name.lower() == location.lower():
-                            found_folder = item
-                            break
+                if desktop.is_dir():  # Checked per call: create_folder may have made it
+                    with os.scandir(desktop) as entries:
+                        for entry in entries:
+                            if entry.name.lower() == location_lower and entry.is_dir():
+                                found_folder = Path(entry.path)
+                                break
                 
                 if found_folder:
                     base_path = found_folder
@@ -157,47 +305,48 @@ class SystemController:
     
     def delete_file(self, file_path):
         """Delete a file safely"""
+        file_path = Path(file_path)
         try:
-            file_path = Path(file_path)
-            if file_path.exists():
-                if file_path.is_file():
-                    file_path.unlink()
-                    return f"Deleted file: {file_path}"
-                else:
-                    return f"'{file_path}' is not a file"
-            else:
-                return f"File '{file_path}' not found"
+            # Just unlink (one syscall) and sort out the failures afterwards
+            os.unlink(file_path)
+            return f"Deleted file: {file_path}"
+        except FileNotFoundError:
+            return f"File '{file_path}' not found"
+        except IsADirectoryError:
+            return f"'{file_path}' is not a file"
+        except PermissionError as e:
+            # Windows and macOS report a directory as a permission error
+            if file_path.is_dir():
+                return f"'{file_path}' is not a file"
+            return f"Failed to delete file: {e}"
         except Exception as e:
             return f"Failed to delete file: {e}"
     
     def get_running_apps(self):
         """Get list of running applications"""
         try:
-            apps = []
-            for proc in psutil.process_iter(['pid', 'name']):
-                if proc.info['name'] and not proc.info['name'].startswith('System'):
-                    apps.append(proc.info['name'])
+            # One pass: skip system processes, dedupe, stop once 10 are found
+            user_apps = {}
+            for _pid, name in _iter_process_names():
+                if not name or name.startswith('System') or name in user_apps:
+                    continue
+                if not name.endswith('.exe') or name.lower() in _LISTED_EXES:
+                    user_apps[name] = None
+                    if len(user_apps) >= 10:
+                        break
             
-            # Remove duplicates and system processes
-            unique_apps = list(set(apps))
-            user_apps = [app for app in unique_apps if not app.endswith('.exe') or 
-                        app.lower() in ['notepad.exe', 'calc.exe', 'chrome.exe', 'firefox.exe']]
-            
-            return f"Running applications: {', '.join(user_apps[:10])}"  # Limit to 10
+            return f"Running applications: {', '.join(user_apps)}"
         except Exception as e:
             return f"Failed to get running apps: {e}"
     
     def adjust_volume(self, adjustment):
         """Adjust volume by relative amount"""
-        if self.os_type == "Windows":
+        if _IS_WINDOWS:
             try:
-                if adjustment.startswith('+'):
-                    return f"Volume increased by {adjustment[1:]}% (placeholder - needs volume control library)"
-                elif adjustment.startswith('-'):
-                    return f"Volume decreased by {adjustment[1:]}% (placeholder - needs volume control library)"
-                else:
-                    return f"Volume adjusted by {adjustment}% (placeholder - needs volume control library)"
+                op = _VOLUME_OPS.get(adjustment[:1])
+                amount = adjustment[1:] if op else adjustment
+                return f"Volume {op or 'adjusted by'} {amount}% (placeholder - needs volume control library)"
             except Exception as e:
                 return f"Failed to adjust volume: {e}"
         
-        return f"Volume control not implemented for {self.os_type}"
\ No newline at end of file
+        return f"Volume control not implemented for {_OS_TYPE}"
\ No newline at end of file
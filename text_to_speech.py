@@ -4,23 +4,38 @@ Handles speech synthesis using Chatterbox TTS (with pyttsx3 fallback)
 """
 
 import threading
+import importlib.util
+import queue
+import re
 import tempfile
+import io
+import wave
+from collections import OrderedDict
+from contextlib import contextmanager
 import os
 import sys
 from pathlib import Path
 
-# Try to import Chatterbox TTS
-try:
-    import torch
-    import torchaudio as ta
-    from chatterbox.tts import ChatterboxTTS
-    from chatterbox.mtl_tts import ChatterboxMultilingualTTS
-    CHATTERBOX_AVAILABLE = True
-    print("Chatterbox TTS loaded successfully!")
-except ImportError as e:
-    print(f"Chatterbox TTS not available: {e}")
+# Chatterbox TTS (torch and the models) is only imported when a
+# TextToSpeech engine is created; here we just check it is installed
+CHATTERBOX_AVAILABLE = all(importlib.util.find_spec(name) for name in ("torch", "chatterbox"))
+if not CHATTERBOX_AVAILABLE:
+    print("Chatterbox TTS not available: torch or chatterbox is not installed")
     print("Falling back to pyttsx3...")
-    CHATTERBOX_AVAILABLE = False
+
+def _import_chatterbox():
+    """Import torch and the Chatterbox models on first use; returns success"""
+    global torch, ChatterboxTTS, ChatterboxMultilingualTTS, CHATTERBOX_AVAILABLE
+    try:
+        import torch
+        from chatterbox.tts import ChatterboxTTS
+        from chatterbox.mtl_tts import ChatterboxMultilingualTTS
+        print("Chatterbox TTS loaded successfully!")
+    except ImportError as e:
+        print(f"Chatterbox TTS not available: {e}")
+        print("Falling back to pyttsx3...")
+        CHATTERBOX_AVAILABLE = False
+    return CHATTERBOX_AVAILABLE
 
 # Always import pyttsx3 for fallback
 try:
@@ -44,22 +59,131 @@ except ImportError:
         PYGAME_AVAILABLE = False
         PLAYSOUND_AVAILABLE = False
 
+# Languages offered by Chatterbox, as (code, name) pairs for get_voices
+_CHATTERBOX_VOICES = (
+    ("en", "English (Chatterbox)"),
+    ("fr", "French (Chatterbox)"),
+    ("es", "Spanish (Chatterbox)"),
+    ("de", "German (Chatterbox)"),
+    ("it", "Italian (Chatterbox)"),
+    ("pt", "Portuguese (Chatterbox)"),
+    ("ru", "Russian (Chatterbox)"),
+    ("ja", "Japanese (Chatterbox)"),
+    ("ko", "Korean (Chatterbox)"),
+    ("zh", "Chinese (Chatterbox)"),
+    ("hi", "Hindi (Chatterbox)"),
+    ("ar", "Arabic (Chatterbox)"),
+    ("tr", "Turkish (Chatterbox)"),
+    ("sw", "Swahili (Chatterbox)"),
+)
+
+# Sentence boundaries for pipelining long text through Chatterbox
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?…])\s+')
+
+def _pin_speech_thread():
+    """
+    Keep the calling (speech) thread on the upper half of the CPU cores
+    
+    The lower half is left to the GUI and speech recognition, and the
+    generation work stops migrating between cores. Skipped on small
+    machines and where the OS offers no thread affinity call.
+    """
+    count = os.cpu_count() or 1
+    if count < 4:
+        return
+    cores = range(count // 2, count)
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, set(cores))  # 0 = the calling thread on Linux
+        elif sys.platform == "win32":
+            import ctypes
+            mask = sum(1 << core for core in cores)
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadAffinityMask.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+            kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), mask)
+    except Exception as e:
+        print(f"⚠️  Could not pin speech thread: {e}")
+
+class StreamPlayer:
+    """Gapless playback of PCM chunks on one pygame mixer channel as they arrive"""
+    
+    def __init__(self):
+        self._chunks = queue.Queue()
+        self._channel = pygame.mixer.find_channel(True)
+        self._thread = threading.Thread(target=self._play_chunks, daemon=True)
+        self._thread.start()
+    
+    def push(self, pcm):
+        """Queue a mono int16 numpy array at the mixer's sample rate"""
+        self._chunks.put(pcm)
+    
+    def finish(self):
+        """Wait until every pushed chunk has played"""
+        self._chunks.put(None)
+        self._thread.join()
+    
+    def _play_chunks(self):
+        channel = self._channel
+        while True:
+            pcm = self._chunks.get()
+            if pcm is None:
+                break
+            sound = pygame.sndarray.make_sound(pcm)
+            # A channel holds one queued sound behind the playing one
+            while channel.get_queue() is not None:
+                pygame.time.wait(10)
+            if channel.get_busy():
+                channel.queue(sound)
+            else:
+                channel.play(sound)
+        while channel.get_busy():
+            pygame.time.wait(10)
+
 class TextToSpeech:
     def __init__(self):
         self.is_speaking = False
         self.current_language = "en"  # Default to English
         self.exaggeration = 0.5  # Default emotional intensity
         self.cfg_weight = 0.5  # Default CFG weight for generation control
+        self.on_done = None  # Called with no arguments when background speech finishes
+        
+        # Recently generated Chatterbox clips (WAV bytes), most recent last
+        self._utterance_cache = OrderedDict()
+        self._utterance_cache_size = 64
+        self._utterance_cache_lock = threading.Lock()
+        
+        # Models are shared by the speech worker and speak_batch's generator
+        self._generate_lock = threading.Lock()
+        self._voice_cache = {}  # (model, prompt path, mtime) -> reference-voice conditioning
+        
+        # The pyttsx3 engine is created once; its run loop is not re-entrant
+        self._pyttsx_lock = threading.Lock()
+        self._pyttsx_busy = False
+        self._pyttsx_voices = None  # (id, name) pairs, read on first get_voices
+        
+        # Background speech is queued to one long-lived worker, in order
+        self._speech_queue = queue.Queue()
+        self._speech_worker = threading.Thread(target=self._speech_loop, name="tts-worker", daemon=True)
+        self._speech_worker.start()
         
         # Initialize the appropriate TTS engine
-        if CHATTERBOX_AVAILABLE:
+        if CHATTERBOX_AVAILABLE and _import_chatterbox():
             self._init_chatterbox()
         else:
             self._init_pyttsx3()
         
-        # Initialize audio playback
+        # Initialize audio playback once; opening the mixer at Chatterbox's
+        # format means clips and streamed PCM play without resampling
+        self._play_channel = None
+        self._playback_stopped = threading.Event()  # Set by stop() to end a playback wait
+        self._pipeline_stopped = threading.Event()  # Set by stop() to end a pipelined reply
         if PYGAME_AVAILABLE:
-            pygame.mixer.init()
+            if self.engine_type == "chatterbox":
+                pygame.mixer.init(frequency=self.english_model.sr, size=-16, channels=1, buffer=512)
+            else:
+                pygame.mixer.init()
+            pygame.mixer.set_reserved(1)  # Channel 0 is kept for _play_audio
+            self._play_channel = pygame.mixer.Channel(0)
     
     def _init_chatterbox(self):
         """Initialize Chatterbox TTS models"""
@@ -83,7 +207,25 @@ class TextToSpeech:
                 else:
                     raise e
             
+            # Inference settings: mixed precision on CUDA (Tensor Cores), fast matmuls;
+            # TTS_DTYPE=fp32 turns mixed precision off
+            self._amp_enabled = self.device == "cuda" and os.environ.get("TTS_DTYPE", "").lower() != "fp32"
+            self._amp_dtype = torch.float16
+            torch.set_float32_matmul_precision("high")
+            if self._amp_enabled and torch.cuda.get_device_capability()[0] >= 8:
+                # Ampere and newer run BF16 natively; store T3's weights in it too
+                self._amp_dtype = torch.bfloat16
+                self._cast_models(torch.bfloat16)
+            if self.device == "cuda":
+                torch.backends.cudnn.benchmark = True
+            
             self.engine_type = "chatterbox"
+            if self.device == "cuda":
+                self._use_channels_last()
+                self._compile_models()
+                self._compile_vocoder_tensorrt()
+            else:
+                self._quantize_models()
             print("Chatterbox TTS models loaded successfully!")
             
         except Exception as e:
@@ -91,6 +233,143 @@ class TextToSpeech:
             print("Falling back to pyttsx3...")
             self._init_pyttsx3()
     
+    def _cast_models(self, dtype):
+        """
+        Cast the T3 transformer's weights to dtype
+        
+        Only T3's autoregressive decoder is bandwidth-bound enough to gain;
+        S3Gen (STFT/mel, vocoder) and the LSTM voice encoder keep FP32 weights
+        and run under autocast only. Normalization layers stay in FP32, as
+        they would under autocast.
+        """
+        import torch.nn as nn
+        norms = (nn.LayerNorm, nn.GroupNorm, nn.modules.batchnorm._BatchNorm)
+        
+        for model in (self.english_model, self.multilingual_model):
+            if model is None:
+                continue
+            t3 = getattr(model, "t3", None)
+            if t3 is None:
+                continue
+            try:
+                t3.to(dtype=dtype)
+                for layer in t3.modules():
+                    if isinstance(layer, norms):
+                        layer.float()
+            except Exception as e:
+                print(f"⚠️  Could not cast t3 to {dtype}: {e}")
+    
+    def _use_channels_last(self):
+        """
+        Store S3Gen's 4-D conv weights channels-last for cuDNN's NHWC Tensor Core kernels
+        
+        Module.to(memory_format=...) only converts 4-D parameters, so the
+        Conv1d vocoder layers are unchanged and only the Conv2d ones are.
+        """
+        for model in (self.english_model, self.multilingual_model):
+            s3gen = getattr(model, "s3gen", None) if model is not None else None
+            if s3gen is None:
+                continue
+            try:
+                s3gen.to(memory_format=torch.channels_last)
+            except Exception as e:
+                print(f"⚠️  channels_last skipped: {e}")
+    
+    def _compile_models(self):
+        """Compile the T3 transformer with CUDA Graphs and capture it once at startup
+        
+        Generation calls the transformer once per token; reduce-overhead mode
+        replays each step as one graph launch instead of many small kernels.
+        Falls back to eager models if compiling is unsupported or fails.
+        """
+        if not hasattr(torch, "compile"):
+            return  # PyTorch < 2.0
+        
+        models = [m for m in (self.english_model, self.multilingual_model) if m is not None]
+        eager = [(m.t3, m.t3.tfmr) for m in models]
+        try:
+            print("Compiling Chatterbox models (one-time warm-up)...")
+            for model in models:
+                model.t3.tfmr = torch.compile(model.t3.tfmr, mode="reduce-overhead", fullgraph=False)
+            # Warm up through the runtime path, so graphs are captured at its dtypes
+            self._run_generate(self.english_model, "warmup", {})
+            if self.multilingual_model is not None:
+                self._run_generate(self.multilingual_model, "warmup", {"language_id": "en"})
+            print("✓ Chatterbox models compiled")
+        except Exception as e:
+            print(f"⚠️  torch.compile unavailable ({e}), using eager models")
+            for t3, tfmr in eager:
+                t3.tfmr = tfmr
+    
+    def _compile_vocoder_tensorrt(self):
+        """
+        Build TensorRT engines for S3Gen's HiFi-GAN vocoder when torch_tensorrt is installed
+        
+        The vocoder's conv stack (HiFTGenerator.decode) is compiled through
+        the torch_tensorrt backend at the inference precision; STFT ops TensorRT
+        lacks stay in PyTorch. Built engines are cached on disk so later
+        runs skip the build. Falls back to PyTorch if anything fails.
+        """
+        try:
+            import torch_tensorrt  # noqa: F401 - registers the "torch_tensorrt" backend
+        except ImportError:
+            return
+        
+        engine_dir = Path.home() / ".cache" / "one-for-all-ai" / "trt"
+        engine_dir.mkdir(parents=True, exist_ok=True)
+        precision = self._amp_dtype if self._amp_enabled else torch.float32
+        options = {
+            "enabled_precisions": {precision},
+            "cache_built_engines": True,
+            "reuse_cached_engines": True,
+            "engine_cache_dir": str(engine_dir),
+        }
+        
+        vocoders = []
+        for model in (self.english_model, self.multilingual_model):
+            hift = getattr(getattr(model, "s3gen", None), "mel2wav", None)
+            if hift is not None and hasattr(hift, "decode"):
+                vocoders.append(hift)
+        if not vocoders:
+            return
+        
+        try:
+            print("Building TensorRT vocoder engines (cached after the first run)...")
+            for hift in vocoders:
+                hift.decode = torch.compile(hift.decode, backend="torch_tensorrt", dynamic=True, options=options)
+            self._run_generate(self.english_model, "warmup", {})
+            print("✓ TensorRT vocoder ready")
+        except Exception as e:
+            print(f"⚠️  TensorRT vocoder unavailable ({e}), using PyTorch")
+            for hift in vocoders:
+                hift.__dict__.pop("decode", None)  # Back to the class's eager decode
+    
+    def _quantize_models(self):
+        """Quantize Linear/LSTM weights to INT8 for CPU inference
+        
+        Chatterbox wrappers are not nn.Modules themselves, so the T3, S3Gen and
+        voice-encoder submodules are quantized in place. Custom layers that
+        do not support it leave the model in FP32.
+        """
+        import torch.nn as nn
+        
+        # Leave cores for the GUI, speech recognition and audio threads
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        
+        for model in (self.english_model, self.multilingual_model):
+            if model is None:
+                continue
+            for name in ("t3", "s3gen", "ve"):
+                module = getattr(model, name, None)
+                if module is None:
+                    continue
+                try:
+                    torch.ao.quantization.quantize_dynamic(
+                        module, {nn.Linear, nn.LSTM}, dtype=torch.qint8, inplace=True
+                    )
+                except Exception as e:
+                    print(f"⚠️  INT8 quantization skipped for {name}: {e}")
+    
     def _init_pyttsx3(self):
         """Initialize pyttsx3 as fallback"""
         if PYTTSX3_AVAILABLE:
@@ -128,16 +407,20 @@ class TextToSpeech:
         except Exception as e:
             print(f"Voice setup error: {e}")
     
-    def speak(self, text, blocking=False, language=None, audio_prompt_path=None, fast_mode=None):
+    def speak(self, text, blocking=False, language=None, audio_prompt_path=None, fast_mode=None, notify=True):
         """
         Convert text to speech
         
         Args:
             text (str): Text to speak
-            blocking (bool): If True, wait for speech to complete
+            blocking (bool): If True, wait for speech to complete; otherwise
+                on_done is called once the speech has finished
             language (str): Language code (e.g., 'en', 'fr', 'zh') for multilingual TTS
             audio_prompt_path (str): Path to reference audio for voice cloning
-            fast_mode (bool): If True, use faster generation settings
+            fast_mode (bool): If True, use faster generation settings; None
+                picks it per sentence from the length
+            notify (bool): If False, background speech does not call on_done
+                (see notify_done)
         """
         if not text:
             return
@@ -145,29 +428,49 @@ class TextToSpeech:
         # Use provided language or default
         lang = language or self.current_language
         
-        # Auto-enable fast mode for short responses
-        if fast_mode is None:
-            fast_mode = len(text) < 100  # Fast mode for responses under 100 chars
-        
         if blocking:
             self._speak_blocking(text, lang, audio_prompt_path, fast_mode)
         else:
-            # Speak in separate thread to avoid blocking GUI
-            threading.Thread(
-                target=self._speak_blocking, 
-                args=(text, lang, audio_prompt_path, fast_mode), 
-                daemon=True
-            ).start()
-    
-    def _speak_blocking(self, text, language="en", audio_prompt_path=None, fast_mode=False):
+            # Speak on the worker thread to avoid blocking GUI
+            self._speech_queue.put((text, lang, audio_prompt_path, fast_mode, notify))
+    
+    def notify_done(self):
+        """Call on_done once everything queued so far has been spoken"""
+        self._speech_queue.put(("", None, None, None, True))
+    
+    def _speech_loop(self):
+        """Worker thread: speak queued requests until None"""
+        _pin_speech_thread()
+        while True:
+            request = self._speech_queue.get()
+            if request is None:
+                break
+            self._speak_and_notify(*request)
+    
+    def _speak_and_notify(self, text, language="en", audio_prompt_path=None, fast_mode=None, notify=True):
+        """Speak text, then report completion through on_done"""
+        if text:
+            self._speak_blocking(text, language, audio_prompt_path, fast_mode)
+        if notify and self.on_done:
+            self.on_done()
+    
+    def _speak_blocking(self, text, language="en", audio_prompt_path=None, fast_mode=None):
         """Internal method to speak text (blocking)"""
         try:
             self.is_speaking = True
-            mode_indicator = "⚡" if fast_mode else "🔊"
+            # Auto-enable fast mode for short responses
+            is_fast = len(text) < 100 if fast_mode is None else fast_mode
+            mode_indicator = "⚡" if is_fast else "🔊"
             print(f"{mode_indicator} Generating speech ({language}): {text}")
             
             if self.engine_type == "chatterbox":
-                self._speak_chatterbox(text, language, audio_prompt_path, fast_mode)
+                sentences = _SENTENCE_SPLIT.split(text.strip())
+                if len(sentences) > 1 and not self._can_stream(self._model_for(language)):
+                    # Generate each sentence while the previous one plays
+                    self._speak_pipelined([(s, language) for s in sentences], 
+                                          audio_prompt_path, fast_mode)
+                else:
+                    self._speak_chatterbox(text, language, audio_prompt_path, is_fast)
             else:
                 self._speak_pyttsx3(text)
                 
@@ -177,117 +480,341 @@ class TextToSpeech:
             self.is_speaking = False
             print("🔇 Speech completed")
     
+    def speak_batch(self, items, audio_prompt_path=None):
+        """
+        Speak several (text, language) pairs in order, blocking until done
+        
+        With Chatterbox the next clip is generated while the current one
+        plays, so synthesis no longer leaves a gap between items.
+        """
+        items = [(text, language or self.current_language) for text, language in items if text]
+        if self.engine_type != "chatterbox":
+            for text, language in items:
+                self._speak_blocking(text, language, audio_prompt_path, len(text) < 100)
+            return
+        
+        self.is_speaking = True
+        try:
+            self._speak_pipelined(items, audio_prompt_path)
+        finally:
+            self.is_speaking = False
+    
+    def _speak_pipelined(self, items, audio_prompt_path=None, fast_mode=None):
+        """
+        Speak (text, language) items with Chatterbox, generating ahead of playback
+        
+        A producer thread generates clips into a queue bounded at two, so it
+        stays at most a couple of clips ahead; this thread plays them in order.
+        fast_mode None picks it per item from the text length.
+        """
+        clips = queue.Queue(maxsize=2)
+        stopped = self._pipeline_stopped
+        stopped.clear()
+        
+        def generate():
+            for text, language in items:
+                if stopped.is_set():
+                    break
+                is_fast = len(text) < 100 if fast_mode is None else fast_mode
+                clips.put((text, language, 
+                           self._generate_chatterbox(text, language, audio_prompt_path, is_fast)))
+            clips.put(None)
+        
+        threading.Thread(target=generate, name="tts-generate", daemon=True).start()
+        while True:
+            clip = clips.get()
+            if clip is None:
+                break
+            if stopped.is_set():
+                continue  # Drain, so the producer can reach its end marker
+            text, language, wav_buffer = clip
+            print(f"🔊 Speaking ({language}): {text}")
+            if wav_buffer:
+                self._play_audio(wav_buffer)
+    
     def _speak_chatterbox(self, text, language="en", audio_prompt_path=None, fast_mode=False):
         """Generate and play speech using Chatterbox TTS (optimized)"""
+        model, options, key = self._generation_settings(text, language, audio_prompt_path, fast_mode)
+        wav_buffer = self._cached_clip(key)
+        if wav_buffer is None and self._stream_chatterbox(text, model, options, key):
+            return
+        if wav_buffer is None:
+            wav_buffer = self._generate_chatterbox(text, language, audio_prompt_path, fast_mode)
+        if wav_buffer:
+            self._play_audio(wav_buffer)
+        elif hasattr(self, 'engine'):
+            # Fallback to pyttsx3 if available
+            self._speak_pyttsx3(text)
+    
+    def _generation_settings(self, text, language="en", audio_prompt_path=None, fast_mode=False):
+        """Pick the model and generate() options; returns (model, options, cache key)"""
+        if fast_mode:
+            # Ultra-fast settings for short responses
+            exaggeration = 0.5  # Minimal emotion for speed
+            cfg_weight = 0.8    # Higher CFG for faster generation
+            temperature = 0.4   # Very low temperature
+            repetition_penalty = 1.2
+        else:
+            # Balanced settings
+            exaggeration = min(self.exaggeration, 1.0)
+            cfg_weight = max(self.cfg_weight, 0.7)
+            temperature = 0.6
+            repetition_penalty = 1.1
+        
+        options = dict(
+            audio_prompt_path=audio_prompt_path,
+            exaggeration=exaggeration,
+            cfg_weight=cfg_weight,
+            temperature=temperature,
+            repetition_penalty=repetition_penalty
+        )
+        
+        # Choose the appropriate model
+        model = self._model_for(language)
+        if model is not self.english_model:
+            options['language_id'] = language
+        
+        # Short phrases repeat a lot (greetings, confirmations): their audio is cached
+        key = None
+        if len(text) <= 200:
+            key = (text, language, audio_prompt_path, exaggeration, cfg_weight, temperature)
+        return model, options, key
+    
+    def _model_for(self, language):
+        """English model for English (or when multilingual is unavailable)"""
+        if language == "en" or self.multilingual_model is None:
+            return self.english_model
+        return self.multilingual_model
+    
+    def _can_stream(self, model):
+        """True if model can stream chunks into the mixer as raw PCM"""
+        if not PYGAME_AVAILABLE or getattr(model, 'generate_stream', None) is None:
+            return False
+        mixer = pygame.mixer.get_init()
+        return bool(mixer) and mixer[0] == model.sr and mixer[2] == 1
+    
+    def _cached_clip(self, key):
+        """Return a cached clip as a fresh BytesIO, or None"""
+        if key is None:
+            return None
+        with self._utterance_cache_lock:
+            wav_bytes = self._utterance_cache.get(key)
+            if wav_bytes is None:
+                return None
+            self._utterance_cache.move_to_end(key)
+        return io.BytesIO(wav_bytes)
+    
+    def _store_clip(self, key, wav_bytes):
+        if key is None:
+            return
+        with self._utterance_cache_lock:
+            self._utterance_cache[key] = wav_bytes
+            if len(self._utterance_cache) > self._utterance_cache_size:
+                self._utterance_cache.popitem(last=False)
+    
+    def _encode_wav(self, wav, sample_rate):
+        """Encode a mono wav tensor as an in-memory 16-bit WAV file"""
+        if wav.dtype != torch.int16:
+            # Chatterbox returns watermarked audio on the CPU; quantize it in
+            # one vectorized pass before the bytes are written out
+            wav = (wav.clamp(-1, 1) * 32767).to(torch.int16)
+        pcm = wav.reshape(-1).cpu().numpy().tobytes()
+        
+        # Each clip gets its own buffer since speak_batch plays one while
+        # the next is being written.
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(pcm)
+        wav_buffer.seek(0)
+        return wav_buffer
+    
+    def _generate_chatterbox(self, text, language="en", audio_prompt_path=None, fast_mode=False):
+        """Generate speech with Chatterbox as an in-memory WAV; returns a BytesIO or None"""
         try:
-            if fast_mode:
-                # Ultra-fast settings for short responses
-                exaggeration = 0.5  # Minimal emotion for speed
-                cfg_weight = 0.8    # Higher CFG for faster generation
-                temperature = 0.4   # Very low temperature
-                repetition_penalty = 1.2
-            else:
-                # Balanced settings
-                exaggeration = min(self.exaggeration, 1.0)
-                cfg_weight = max(self.cfg_weight, 0.7)
-                temperature = 0.6
-                repetition_penalty = 1.1
+            model, options, key = self._generation_settings(text, language, audio_prompt_path, fast_mode)
+            wav_buffer = self._cached_clip(key)
+            if wav_buffer is not None:
+                return wav_buffer
             
-            # Choose the appropriate model
-            if language == "en" or self.multilingual_model is None:
-                model = self.english_model
-                wav = model.generate(
-                    text, 
-                    audio_prompt_path=audio_prompt_path,
-                    exaggeration=exaggeration,
-                    cfg_weight=cfg_weight,
-                    temperature=temperature,
-                    repetition_penalty=repetition_penalty
-                )
-            else:
-                model = self.multilingual_model
-                wav = model.generate(
-                    text, 
-                    language_id=language,
-                    audio_prompt_path=audio_prompt_path,
-                    exaggeration=exaggeration,
-                    cfg_weight=cfg_weight,
-                    temperature=temperature,
-                    repetition_penalty=repetition_penalty
-                )
-            
-            # Save to temporary file and play
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_path = temp_file.name
-                ta.save(temp_path, wav, model.sr)
+            wav = self._run_generate(model, text, options)
             
-            # Play the audio
-            self._play_audio(temp_path)
-            
-            # Clean up temporary file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            # Encode to WAV in memory; playback reads it straight from the buffer
+            wav_buffer = self._encode_wav(wav, model.sr)
+            self._store_clip(key, wav_buffer.getvalue())
+            return wav_buffer
                 
         except Exception as e:
             print(f"Chatterbox TTS error: {e}")
-            # Fallback to pyttsx3 if available
-            if hasattr(self, 'engine'):
-                self._speak_pyttsx3(text)
+            return None
+    
+    def _stream_chatterbox(self, text, model, options, key=None):
+        """
+        Play speech chunk by chunk while it is being generated
+        
+        Needs a model with generate_stream (e.g. the chatterbox-streaming
+        build) and a mixer opened at the model's rate in mono, since chunks
+        are played as raw PCM. Returns False when streaming is not possible
+        so the caller can generate the whole clip instead.
+        """
+        if not self._can_stream(model):
+            return False
+        
+        player = StreamPlayer()
+        pieces = []
+        try:
+            with self._generation(model, options) as options:
+                for chunk, _metrics in model.generate_stream(text, **options):
+                    pcm = (chunk.squeeze(0).clamp(-1, 1) * 32767).to(torch.int16).cpu()
+                    pieces.append(pcm)
+                    player.push(pcm.numpy())
+        except Exception as e:
+            print(f"Chatterbox streaming error: {e}")
+            return bool(pieces)  # Part of it was heard; don't cache a cut-off clip
+        finally:
+            player.finish()
+        
+        if not pieces:
+            return False  # Nothing was streamed; let the caller generate the whole clip
+        self._store_clip(key, self._encode_wav(torch.cat(pieces).unsqueeze(0), model.sr).getvalue())
+        return True
     
     def _speak_pyttsx3(self, text):
         """Speak using pyttsx3 fallback"""
         try:
-            # Stop any current speech
-            self.engine.stop()
-            
-            # Speak the text
-            self.engine.say(text)
-            self.engine.runAndWait()
+            with self._pyttsx_lock:
+                self._pyttsx_busy = True
+                try:
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+                finally:
+                    self._pyttsx_busy = False
             
         except Exception as e:
             print(f"pyttsx3 TTS error: {e}")
             # Try reinitializing engine if run loop error
             if "run loop already started" in str(e):
                 try:
-                    self.engine = pyttsx3.init()
-                    self.setup_voice()
-                    self.engine.say(text)
-                    self.engine.runAndWait()
+                    with self._pyttsx_lock:
+                        self.engine = pyttsx3.init()
+                        self.setup_voice()
+                        self.engine.say(text)
+                        self.engine.runAndWait()
                 except Exception as e2:
                     print(f"pyttsx3 reinit error: {e2}")
     
-    def _play_audio(self, audio_path):
-        """Play audio file using available audio library"""
+    def _run_generate(self, model, text, options):
+        """Run model.generate (one call at a time) with autograd off"""
+        with self._generation(model, options, autocast=False) as options:
+            return self._generate(model, text, options)
+    
+    @contextmanager
+    def _generation(self, model, options, autocast=True):
+        """
+        Hold the models for one generation and yield the options to call with
+        
+        Takes the generation lock and turns autograd off (plus autocast, unless
+        the caller applies it itself). With an audio prompt, the cached
+        conditioning for that voice is swapped in instead of re-encoding the
+        reference audio, and the model's default voice is restored afterwards.
+        """
+        prompt = options.get('audio_prompt_path')
+        amp = autocast and self._amp_enabled
+        with self._generate_lock, torch.inference_mode(), \
+                torch.autocast(device_type=self.device, dtype=self._amp_dtype, enabled=amp):
+            if not prompt or not hasattr(model, 'prepare_conditionals'):
+                yield options
+                return
+            
+            default_conds = model.conds
+            model.conds = self._voice_conditionals(model, prompt, options['exaggeration'])
+            try:
+                yield dict(options, audio_prompt_path=None)
+            finally:
+                model.conds = default_conds
+    
+    def _voice_conditionals(self, model, prompt, exaggeration):
+        """Conditioning for a reference audio prompt, computed once per file version"""
+        key = (id(model), prompt, os.path.getmtime(prompt))
+        conds = self._voice_cache.get(key)
+        if conds is None:
+            model.prepare_conditionals(prompt, exaggeration=exaggeration)
+            conds = self._voice_cache[key] = model.conds
+            if len(self._voice_cache) > 4:
+                self._voice_cache.pop(next(iter(self._voice_cache)))
+        return conds
+    
+    def _generate(self, model, text, options):
+        """model.generate, under FP16/BF16 autocast on CUDA"""
+        if self._amp_enabled:
+            try:
+                with torch.autocast(device_type=self.device, dtype=self._amp_dtype):
+                    return model.generate(text, **options)
+            except RuntimeError as e:
+                # Some layers may not support half precision; stay in FP32 from now on
+                print(f"⚠️  Mixed precision generation failed ({e}), using FP32")
+                self._amp_enabled = False
+                if self._amp_dtype == torch.bfloat16:
+                    self._cast_models(torch.float32)
+        return model.generate(text, **options)
+    
+    def _play_audio(self, audio):
+        """Play a WAV file path or in-memory WAV buffer using available audio library"""
         try:
-            print(f"Playing audio: {audio_path}")
+            if isinstance(audio, io.BytesIO):
+                print("Playing generated audio")
+            else:
+                print(f"Playing audio: {audio}")
             if PYGAME_AVAILABLE:
-                pygame.mixer.music.load(audio_path)
-                pygame.mixer.music.play()
+                # Decode straight into a Sound and play it on the reserved channel
+                sound = pygame.mixer.Sound(audio)
+                self._playback_stopped.clear()
+                self._play_channel.play(sound)
                 print("Started pygame playback...")
-                # Wait for playback to complete
-                while pygame.mixer.music.get_busy():
-                    pygame.time.wait(100)
+                # Sleep for the clip's length instead of polling; stop() wakes us early
+                if not self._playback_stopped.wait(sound.get_length()):
+                    # Let the mixer drain its last buffer
+                    while self._play_channel.get_busy() and not self._playback_stopped.is_set():
+                        pygame.time.wait(5)
                 print("Pygame playback completed.")
             elif PLAYSOUND_AVAILABLE:
                 from playsound import playsound
                 print("Using playsound...")
-                playsound(audio_path)
+                if isinstance(audio, io.BytesIO):
+                    self._playsound_buffer(playsound, audio)
+                else:
+                    playsound(audio)
                 print("Playsound completed.")
             else:
-                print(f"Audio generated but no playback library available: {audio_path}")
+                print("Audio generated but no playback library available")
         except Exception as e:
             print(f"Audio playback error: {e}")
     
+    def _playsound_buffer(self, playsound, wav_buffer):
+        """playsound needs a path, so write the buffer to a temporary WAV"""
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+            temp_file.write(wav_buffer.getbuffer())
+            temp_path = temp_file.name
+        try:
+            playsound(temp_path)
+        finally:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+    
     def stop(self):
         """Stop current speech"""
         try:
             if self.engine_type == "chatterbox":
                 if PYGAME_AVAILABLE:
-                    pygame.mixer.music.stop()
-            else:
-                self.engine.stop()
+                    pygame.mixer.stop()  # Clips and streamed chunks all play on mixer channels
+                    self._playback_stopped.set()
+                self._pipeline_stopped.set()
+            elif self._pyttsx_busy:
+                self.engine.stop()  # Only interrupt an utterance that is actually running
             self.is_speaking = False
         except Exception as e:
             print(f"Error stopping TTS: {e}")
@@ -334,31 +861,23 @@ class TextToSpeech:
             print("Volume setting not applicable for Chatterbox TTS.")
     
     def get_voices(self):
-        """Get list of available voices/languages"""
+        """Get (id, name) pairs of available voices/languages"""
         if self.engine_type == "chatterbox":
-            return [
-                ("en", "English (Chatterbox)"),
-                ("fr", "French (Chatterbox)"),
-                ("es", "Spanish (Chatterbox)"),
-                ("de", "German (Chatterbox)"),
-                ("it", "Italian (Chatterbox)"),
-                ("pt", "Portuguese (Chatterbox)"),
-                ("ru", "Russian (Chatterbox)"),
-                ("ja", "Japanese (Chatterbox)"),
-                ("ko", "Korean (Chatterbox)"),
-                ("zh", "Chinese (Chatterbox)"),
-                ("hi", "Hindi (Chatterbox)"),
-                ("ar", "Arabic (Chatterbox)"),
-                ("tr", "Turkish (Chatterbox)"),
-                ("sw", "Swahili (Chatterbox)")
-            ]
+            return _CHATTERBOX_VOICES
         else:
-            try:
-                voices = self.engine.getProperty('voices')
-                return [(voice.id, voice.name) for voice in voices]
-            except Exception as e:
-                print(f"Error getting voices: {e}")
-                return []
+            if self._pyttsx_voices is None:
+                self.refresh_voices()
+            return self._pyttsx_voices
+    
+    def refresh_voices(self):
+        """Re-read the installed pyttsx3 voices (get_voices caches them)"""
+        try:
+            voices = self.engine.getProperty('voices')
+            self._pyttsx_voices = tuple((voice.id, voice.name) for voice in voices)
+        except Exception as e:
+            print(f"Error getting voices: {e}")
+            self._pyttsx_voices = ()
+        return self._pyttsx_voices
     
     def set_voice(self, voice_id):
         """Set voice by ID (language code for Chatterbox)"""
@@ -374,7 +893,7 @@ class TextToSpeech:
         """Convenience method for multilingual speech"""
         self.speak(text, language=language)
     
-    def speak_with_emotion(self, text, exaggeration=None, cfg=None):
+    def speak_with_emotion(self, text, exaggeration=None, cfg=None, blocking=False):
         """Speak with specific emotional settings"""
         old_exag = self.exaggeration
         old_cfg_weight = self.cfg_weight
@@ -384,7 +903,7 @@ class TextToSpeech:
         if cfg is not None:
             self.set_cfg(cfg)
         
-        self.speak(text)
+        self.speak(text, blocking=blocking)
         
         # Restore previous settings
         self.exaggeration = old_exag
@@ -450,6 +969,7 @@ class TextToSpeech:
     def cleanup(self):
         """Clean up TTS resources"""
         try:
+            self._speech_queue.put(None)
             self.stop()
             if PYGAME_AVAILABLE:
                 pygame.mixer.quit()
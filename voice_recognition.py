@@ -5,22 +5,63 @@ Handles speech-to-text functionality using the SpeechRecognition library
 
 import speech_recognition as sr
 import threading
+import queue
 import time
 import sys
 import platform
+from collections import deque
+
+# Optional local speech-to-text (falls back to Google's web API)
+try:
+    import numpy as np
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+_ASR_RATE = 16000  # Sample rate faster-whisper expects
+
+# Optional voice activity detection for quicker end-of-phrase detection
+try:
+    import webrtcvad
+    VAD_AVAILABLE = True
+except ImportError:
+    VAD_AVAILABLE = False
+
+# WebRTC VAD capture format: 20 ms frames of 16 kHz, 16-bit mono audio
+_VAD_RATE = 16000
+_VAD_FRAME = 320
+_VAD_END_FRAMES = 10  # 200 ms of non-speech ends a phrase
+_VAD_PREROLL_FRAMES = 15  # Audio kept from just before speech starts
+_VAD_PARTIAL_FRAMES = 50  # Interim transcript of a phrase in progress every second
 
 class VoiceRecognition:
     def __init__(self):
         self.recognizer = sr.Recognizer()
         self.microphone = None
+        self._source = None  # The microphone, kept open between uses
         self.is_listening = False
         self.callbacks = {}
+        self._audio_q = queue.Queue()  # (AudioData, is_final_phrase) waiting for recognition
+        self._stopper = None  # Stops the background capture thread
         
         # Configure recognizer
         self.recognizer.energy_threshold = 300
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 0.8
         
+        # With VAD, phrases end after 200 ms of non-speech instead of 800 ms
+        self._vad = None
+        if VAD_AVAILABLE:
+            self._vad = webrtcvad.Vad(2)
+            self.recognizer.dynamic_energy_threshold = False
+        
+        # Local INT8 Whisper model, so phrases are not sent over the network
+        self.asr = None
+        if WHISPER_AVAILABLE:
+            self.init_whisper()
+        
         # Try to initialize microphone
         self.init_microphone()
     
@@ -28,7 +69,14 @@ class VoiceRecognition:
         """Initialize microphone with fallback options"""
         try:
             # Try to use default microphone
-            self.microphone = sr.Microphone()
+            if self._vad:
+                self.microphone = sr.Microphone(sample_rate=_VAD_RATE, chunk_size=_VAD_FRAME)
+            elif self.asr:
+                self.microphone = sr.Microphone(sample_rate=_ASR_RATE)  # Whisper's native rate
+            else:
+                self.microphone = sr.Microphone()
+            # Open the PyAudio stream once; every listen reads from it
+            self._source = self.microphone.__enter__()
             self.calibrate_microphone()
             print("✓ Microphone initialized successfully")
         except Exception as e:
@@ -38,28 +86,89 @@ class VoiceRecognition:
                 print("   1. Run: python install_pyaudio.py")
                 print("   2. Or continue with text input only")
             print("Microphone functionality will be limited")
-            self.microphone = None
+            self.close_microphone()
+    
+    def close_microphone(self):
+        """Close the shared microphone stream"""
+        if self._source:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception as e:
+                print(f"Error closing microphone: {e}")
+        self._source = None
+        self.microphone = None
+    
+    def init_whisper(self):
+        """Load the local faster-whisper model"""
+        try:
+            if ctranslate2.get_cuda_device_count() > 0:
+                self.asr = WhisperModel("small.en", device="cuda", compute_type="int8_float16")
+            else:
+                self.asr = WhisperModel("small.en", device="cpu", compute_type="int8")
+            print("✓ Local speech recognition (faster-whisper) loaded")
+        except Exception as e:
+            print(f"⚠️  faster-whisper unavailable, using Google recognition: {e}")
+            self.asr = None
+    
+    def transcribe(self, audio):
+        """
+        Turn captured AudioData into text
+        
+        Uses the local Whisper model when it loaded, otherwise (or if it
+        fails) Google's web API. Raises sr.UnknownValueError when nothing
+        intelligible was said.
+        """
+        if self.asr:
+            try:
+                text = self._transcribe_local(audio)
+                if not text:
+                    raise sr.UnknownValueError()
+                return text
+            except sr.UnknownValueError:
+                raise
+            except Exception as e:
+                print(f"Local recognition failed, trying Google: {e}")
+        return self.recognizer.recognize_google(audio)
+    
+    def _transcribe_local(self, audio):
+        """Transcribe AudioData with the local Whisper model"""
+        # Whisper takes 16 kHz float32 samples; the microphone already records
+        # 16 kHz 16-bit audio, so the captured bytes are read in place
+        if audio.sample_rate == _ASR_RATE and audio.sample_width == 2:
+            pcm = memoryview(audio.frame_data)
+        else:
+            pcm = audio.get_raw_data(convert_rate=_ASR_RATE, convert_width=2)
+        samples = np.frombuffer(pcm, dtype=np.int16) * np.float32(1 / 32768)
+        segments, _ = self.asr.transcribe(samples, language="en", beam_size=1, vad_filter=True)
+        return "".join(segment.text for segment in segments).strip()
     
     def calibrate_microphone(self):
         """Calibrate microphone for ambient noise"""
         if not self.microphone:
             return
         try:
-            with self.microphone as source:
-                print("Calibrating microphone for ambient noise...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                print("Microphone calibrated")
+            print("Calibrating microphone for ambient noise...")
+            self.recognizer.adjust_for_ambient_noise(self._source, duration=1)
+            print("Microphone calibrated")
         except Exception as e:
             print(f"Microphone calibration failed: {e}")
-            self.microphone = None
+            self.close_microphone()
     
-    def set_callbacks(self, on_result=None, on_error=None, on_start=None, on_stop=None):
-        """Set callback functions for voice recognition events"""
+    def set_callbacks(self, on_result=None, on_error=None, on_start=None, on_stop=None, on_partial=None):
+        """
+        Set callback functions for voice recognition events
+        
+        on_partial(text) receives in-progress text for the current utterance
+        before on_result delivers the final text; an empty string means the
+        utterance was dropped. Interim text needs the local Whisper model and
+        WebRTC VAD capture; otherwise only the final text is delivered.
+        """
         self.callbacks = {
             'on_result': on_result,
             'on_error': on_error,
             'on_start': on_start,
-            'on_stop': on_stop
+            'on_stop': on_stop,
+            'on_partial': on_partial
         }
     
     def start_listening(self):
@@ -77,52 +186,152 @@ class VoiceRecognition:
         if self.callbacks.get('on_start'):
             self.callbacks['on_start']()
         
+        # Capture runs on a background thread and keeps reading the
+        # microphone while phrases are recognized here
+        self._audio_q = queue.Queue()
+        next_phrase = self._listen_vad if self._vad else self._listen_energy
+        self._stopper = self._capture_in_background(next_phrase, self._on_phrase)
+        
         try:
-            while self.is_listening:
+            self._recognize_loop()
+        finally:
+            self.is_listening = False
+            # Wait for capture to finish, so a quick restart never has two
+            # threads reading the shared stream
+            self._stopper(wait_for_stop=True)
+            self._stopper = None
+            if self.callbacks.get('on_stop'):
+                self.callbacks['on_stop']()
+    
+    def _capture_in_background(self, next_phrase, callback):
+        """
+        Capture phrases from the open microphone on a background thread
+        
+        Works like Recognizer.listen_in_background: next_phrase(running)
+        returns each phrase's AudioData (or None), callback(recognizer,
+        audio) receives it, and the returned function stops capture.
+        """
+        running = [True]
+        
+        def capture():
+            while running[0]:
                 try:
-                    # Listen for audio with timeout
-                    with self.microphone as source:
-                        audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                    
-                    # Recognize speech
-                    text = self.recognizer.recognize_google(audio)
-                    
-                    if text and self.callbacks.get('on_result'):
-                        self.callbacks['on_result'](text)
-                        
+                    audio = next_phrase(running)
                 except sr.WaitTimeoutError:
-                    # Timeout is normal, continue listening
-                    pass
-                except sr.UnknownValueError:
-                    # Could not understand audio, continue listening
-                    pass
-                except sr.RequestError as e:
-                    if self.callbacks.get('on_error'):
-                        self.callbacks['on_error'](f"Recognition service error: {e}")
-                    break
+                    continue
                 except Exception as e:
-                    if self.callbacks.get('on_error'):
-                        self.callbacks['on_error'](f"Unexpected error: {e}")
+                    # e.g. the device was unplugged; end listening instead of
+                    # leaving the recognition loop waiting forever
+                    if running[0] and self.callbacks.get('on_error'):
+                        self.callbacks['on_error'](f"Microphone error: {e}")
+                    self._audio_q.put(None)
                     break
+                if audio is not None and running[0]:
+                    callback(self.recognizer, audio)
+        
+        def stopper(wait_for_stop=True):
+            running[0] = False
+            if wait_for_stop:
+                listener.join()  # A phrase in progress can take up to its time limit
+        
+        listener = threading.Thread(target=capture, name="mic-capture", daemon=True)
+        listener.start()
+        return stopper
+    
+    def _listen_energy(self, running, phrase_time_limit=5):
+        """Read one phrase, endpointed by the recognizer's energy threshold"""
+        return self.recognizer.listen(self._source, timeout=1, phrase_time_limit=phrase_time_limit)
+    
+    def _listen_vad(self, running, phrase_time_limit=5):
+        """
+        Read one phrase, endpointed by WebRTC VAD
+        
+        With the local Whisper model, the phrase so far is also queued each
+        second so on_partial can show interim text.
+        """
+        max_frames = int(phrase_time_limit * 1000 / 20)
+        stream = self._source.stream
+        partials = self.asr is not None and self.callbacks.get('on_partial') is not None
+        preroll = deque(maxlen=_VAD_PREROLL_FRAMES)
+        frames = []
+        silent = 0
+        while running[0]:
+            frame = stream.read(_VAD_FRAME)
+            speech = self._vad.is_speech(frame, _VAD_RATE)
+            if not frames:
+                preroll.append(frame)
+                if speech:
+                    frames = list(preroll)
+                continue
+            frames.append(frame)
+            silent = 0 if speech else silent + 1
+            if silent >= _VAD_END_FRAMES or len(frames) >= max_frames:
+                return sr.AudioData(b"".join(frames), _VAD_RATE, 2)
+            if partials and len(frames) % _VAD_PARTIAL_FRAMES == 0:
+                # The phrase so far, for an interim transcript
+                self._audio_q.put((sr.AudioData(b"".join(frames), _VAD_RATE, 2), False))
+        return None
+    
+    def _on_phrase(self, recognizer, audio):
+        """Queue a captured phrase for recognition (capture thread)"""
+        self._audio_q.put((audio, True))
+    
+    def _recognize_loop(self):
+        """Recognize queued phrases until listening stops"""
+        while self.is_listening:
+            item = self._audio_q.get()
+            if item is None:
+                break
+            audio, final = item
+            if not final:
+                self._show_partial(audio)
+                continue
+            try:
+                text = self.transcribe(audio)
+                
+                if text and self.callbacks.get('on_result'):
+                    self.callbacks['on_result'](text)
                     
-        finally:
-            self.is_listening = False
-            if self.callbacks.get('on_stop'):
-                self.callbacks['on_stop']()
+            except sr.UnknownValueError:
+                # Could not understand audio, continue listening
+                if self.callbacks.get('on_partial'):
+                    self.callbacks['on_partial']("")
+            except sr.RequestError as e:
+                if self.callbacks.get('on_partial'):
+                    self.callbacks['on_partial']("")
+                if self.callbacks.get('on_error'):
+                    self.callbacks['on_error'](f"Recognition service error: {e}")
+                break
+            except Exception as e:
+                if self.callbacks.get('on_error'):
+                    self.callbacks['on_error'](f"Unexpected error: {e}")
+                break
+    
+    def _show_partial(self, audio):
+        """Send the interim transcript of a phrase in progress to on_partial"""
+        if not self._audio_q.empty():
+            return  # Newer audio is waiting; it matters more than a stale partial
+        try:
+            text = self._transcribe_local(audio)
+        except Exception:
+            return
+        if text and self.callbacks.get('on_partial'):
+            self.callbacks['on_partial'](text)
     
     def stop_listening(self):
         """Stop voice recognition"""
         self.is_listening = False
+        if self._stopper:
+            self._audio_q.put(None)  # Wake the recognition loop
     
     def recognize_once(self, timeout=5):
         """Recognize speech once with timeout"""
         try:
-            with self.microphone as source:
-                print("Listening...")
-                audio = self.recognizer.listen(source, timeout=timeout)
+            print("Listening...")
+            audio = self.recognizer.listen(self._source, timeout=timeout)
             
             print("Recognizing...")
-            text = self.recognizer.recognize_google(audio)
+            text = self.transcribe(audio)
             return text
             
         except sr.WaitTimeoutError:
@@ -138,16 +347,19 @@ class VoiceRecognition:
     
     def cleanup(self):
         """Clean up resources"""
+        stopper = self._stopper
         self.stop_listening()
+        if stopper:
+            stopper(wait_for_stop=True)  # Capture must finish reading before the stream closes
+        self.close_microphone()
     
     def test_microphone(self):
         """Test if microphone is working"""
         try:
-            with self.microphone as source:
-                print("Testing microphone... Say something!")
-                audio = self.recognizer.listen(source, timeout=3)
+            print("Testing microphone... Say something!")
+            audio = self.recognizer.listen(self._source, timeout=3)
             
-            text = self.recognizer.recognize_google(audio)
+            text = self.transcribe(audio)
             print(f"Microphone test successful. Heard: {text}")
             return True
             